@@ -1,13 +1,57 @@
+import time
+STARTUP_T0 = time.perf_counter()
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk
 from PIL import Image, ImageTk
 import tkinter.font as tkfont
-import os
 from pathlib import Path
-import traceback
+import threading
 import sys
-import json
+import os
+from mojist.backgrounds import PREVIEW_SIZE, BackgroundCache, DecodedBackground, decode_preview
+from mojist.cache import LRUCache
+from mojist.effects import EFFECT_DEFAULTS, effect_label
+from mojist.history import History
+from mojist.fonts import FamilyPrefixIndex, FontFamilyCache, ensure_font_index, font_index_ready, load_font
+from mojist.layers import LayerStack, TextLayer
+from mojist.memory import DEFAULT_BUDGET, MemoryBudget, release_photo
+from mojist.project import LAYER_FIELDS
+from mojist.render import RenderedText, render_text_sprite
+from mojist.scheduler import RedrawScheduler
+from mojist.startup import StartupTimeline
+from mojist.thumbs import ThumbnailStore
+from mojist.trace import traced, tracer
+
+TK_OUTLINE_LIMIT = 10
+MOVE_REPEAT_DELAY_MS = 400
+MOVE_REPEAT_MS = 33
+NUDGE_RELEASE_MS = 40
+NUDGE_ACCELERATION = ((2.5, 16), (1.5, 8), (0.8, 4), (0.4, 2), (0.0, 1))
+SHIFT_MASK = 0x0001
+
+
+def _acceleration(held):
+    return next(factor for after, factor in NUDGE_ACCELERATION if held >= after)
+
+
+def _active_layer_attr(name):
+    return property(
+        lambda self: getattr(self.layers.active, name),
+        lambda self, value: setattr(self.layers.active, name, value)
+    )
+
+
 class MojistApp:
+    fixed_text = _active_layer_attr("text")
+    selected_font_name = _active_layer_attr("font_name")
+    font_size = _active_layer_attr("font_size")
+    text_color = _active_layer_attr("text_color")
+    outline_color = _active_layer_attr("outline_color")
+    outline_width = _active_layer_attr("outline_width")
+    effects = _active_layer_attr("effects")
+    x = _active_layer_attr("x")
+    y = _active_layer_attr("y")
+
     def __init__(self, root):
         self.root = root
         
@@ -15,27 +59,47 @@ class MojistApp:
         self.BG_FOLDER = self.BASE_DIR / "Image"
         self.ICON_PATH = self.BASE_DIR / "assets" / "favicon.ico"
         self.PROJECTS_FOLDER = self.BASE_DIR / "Projects"
+        self.CACHE_FOLDER = self.BASE_DIR / "Cache"
         self.BG_FOLDER.mkdir(exist_ok=True)
         self.ICON_PATH.parent.mkdir(exist_ok=True)
         self.PROJECTS_FOLDER.mkdir(exist_ok=True)
         self.THUMBNAIL_SIZE = (160, 90)
-        self.THUMBS_PER_PAGE = 9
+        self.PROXY_CACHE_BYTES = 1024 * 1024 * 1024
+        self.startup = StartupTimeline(STARTUP_T0, self.CACHE_FOLDER / "startup_timeline.json")
+        self.startup.mark("init")
+        self._setup_trace()
+        threading.Thread(target=ensure_font_index, name="font-index", daemon=True).start()
 
         self.image = None
         self.photo = None
-        self.font_list = sorted(f for f in tkfont.families() if "@" not in f)
-        self.selected_font_name = self._get_initial_font()
-        self.font_size = 50
-        self.text_color = "white"
-        self.outline_color = "black"
-        self.outline_width = 2
-        self.x, self.y = 512, 502
+        self.background = None
+        self.shown_background = None
+        self.memory = MemoryBudget(self._memory_budget())
+        self.history = History(counted_elsewhere=lambda value: isinstance(value, DecodedBackground) and not value.evicted)
+        self.memory.register("history", self.history, priority=4, main_thread_only=True)
+        self.font_family_cache = FontFamilyCache(self.CACHE_FOLDER / "font_families.json")
+        cached_fonts, fonts_fresh = self.font_family_cache.load()
+        self.font_list = cached_fonts or self._query_font_families()
+        self.font_list_stale = bool(cached_fonts) and not fonts_fresh
+        self.font_prefix_index = FamilyPrefixIndex(self.font_list)
+        self.font_typeahead = ""
+        self.font_typeahead_time = 0
+        self.font_feed_job = None
+        self.layers = LayerStack([TextLayer(font_name=self._get_initial_font())])
+        self.text_cache = LRUCache(64 * 1024 * 1024, lambda rendered: rendered.nbytes, self._release_rendered)
+        self.memory.register("text_cache", self.text_cache, priority=3, main_thread_only=True)
         self.adjust_x, self.adjust_y = self.x, self.y
 
-        self.fixed_text = None
         self.preset_text = None
 
         self.repeat_job = None
+        self.move_started = 0.0
+        self.nudge_started = 0.0
+        self.nudge_last = 0.0
+        self.nudge_key = None
+        self.nudge_release_job = None
+        self.drag = None
+        self.drag_cursor = ""
 
         self.adjust_window = None
         self.preset_edit_window = None
@@ -43,19 +107,134 @@ class MojistApp:
         self.adjust_initial_text_color = ""
         self.adjust_initial_outline_color = ""
         self.adjust_initial_outline_width = 0 
+        self.adjust_initial_effects = ()
         self.adjust_initial_font_size = 0 
         self.adjust_step = tk.IntVar(value=1) 
         
         self.bg_image_files = []
-        self.bg_total_pages = 1
-        self.bg_current_page = 0
-        self.bg_selected_index = None
-        self.bg_thumbs = [] 
+        self.bg_selected_id = None
+        self.bg_gallery = None
+        self.bg_index = None
+        self.bg_watcher = None
+        self.bg_cache = BackgroundCache(
+            self.root,
+            proxy_store=ThumbnailStore(
+                self.CACHE_FOLDER / "proxies", PREVIEW_SIZE, decode=decode_preview, max_bytes=self.PROXY_CACHE_BYTES
+            ),
+            on_evict=self._release_background
+        )
+        self.memory.register("background_cache", self.bg_cache.memory, priority=2, main_thread_only=True)
+        self.memory.gauge("gallery_photos", lambda: self.bg_gallery.photo_bytes() if self.bg_gallery is not None else 0)
+        self.thumbnail_store = None
+        self.thumbnail_loader = None
+        self.project_library = None
+        self.library_window = None
+        self.trace_window = None
+        self.export_window = None
+        self.export_executor = None
 
         self._setup_window()
+        self.redraw = RedrawScheduler(self.root, self._apply_redraw)
         self._create_widgets()
+        self._refresh_layer_combo()
+        self._redraw_all()
+        self.history.reset(self._history_state())
+        self.root.bind("<Map>", self._on_first_map, add="+")
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.startup.mark("widgets")
+
+    def _on_close(self):
+        if self.thumbnail_loader is not None:
+            self.thumbnail_loader.shutdown()
+        self.bg_cache.close()
+        self.root.destroy()
+
+    def _on_first_map(self, event):
+        if event.widget is not self.root or "window" in self.startup.marks:
+            return
+        self._startup_mark("window")
+        self.root.after(10, self._deferred_startup)
+
+    def _deferred_startup(self):
         self._load_initial_image()
-        self.update_text()
+        self._feed_font_combo()
+        if self.font_list_stale:
+            self.root.after(500, self._refresh_font_list)
+        if not font_index_ready():
+            self.root.after(50, self._wait_font_index)
+        self._prune_in_background(self.bg_cache.proxy_store)
+
+    def _prune_in_background(self, store):
+        threading.Thread(target=store.prune, name="cache-prune", daemon=True).start()
+
+    def _wait_font_index(self):
+        if font_index_ready():
+            self._redraw_all()
+        else:
+            self.root.after(50, self._wait_font_index)
+
+    def _startup_mark(self, name):
+        self.startup.mark(name)
+        if all(m in self.startup.marks for m in ("window", "first_text", "background")):
+            self.startup.finish()
+
+    def _setup_trace(self):
+        trace_path = os.environ.get("MOJIST_TRACE")
+        if not trace_path:
+            return
+        import atexit
+
+        tracer.enable()
+        if trace_path == "1":
+            trace_path = self.CACHE_FOLDER / "trace.json"
+        atexit.register(tracer.dump, trace_path)
+
+    def _sample_trace_counters(self):
+        tracer.counter("canvas", items=len(self.canvas.find_all()), layers=len(self.layers))
+        memory = self.memory.stats()
+        tracer.counter("memory", bytes=memory["bytes"], max_bytes=memory["max_bytes"], evictions=memory["evictions"])
+        for name, stats in memory["caches"].items():
+            tracer.counter(name, **{k: v for k, v in stats.items() if k in ("hit_rate", "items", "undo", "bytes")})
+
+    def _memory_budget(self):
+        try:
+            return int(os.environ.get("MOJIST_MEMORY_MB", "")) * 1024 * 1024
+        except ValueError:
+            return DEFAULT_BUDGET
+
+    def _release_rendered(self, key, rendered):
+        if not any(layer.photo is rendered.photo for layer in self.layers):
+            release_photo(self.root, rendered.photo)
+            rendered.photo = None
+
+    def _release_background(self, key, decoded):
+        decoded.evicted = True
+        if decoded is not self.background and decoded is not self.shown_background:
+            self._release_background_photo(decoded)
+
+    def _release_background_photo(self, decoded):
+        release_photo(self.root, decoded.photo)
+        decoded.photo = None
+
+    def open_trace_window(self):
+        if self.trace_window and self.trace_window.exists():
+            self.trace_window.lift()
+            return
+        from mojist.trace_window import TraceStatsWindow
+
+        self.trace_window = TraceStatsWindow(self.root, tracer, self.CACHE_FOLDER, sample=self._sample_trace_counters)
+
+    def _ensure_bg_services(self):
+        if self.bg_index is not None:
+            return
+        from mojist.folder_index import FolderIndex
+        from mojist.thumbs import ThumbnailLoader, ThumbnailStore
+
+        self.bg_index = FolderIndex(self.BG_FOLDER, self.CACHE_FOLDER / "image_index.json")
+        self.thumbnail_store = ThumbnailStore(self.CACHE_FOLDER / "thumbnails", self.THUMBNAIL_SIZE)
+        self._prune_in_background(self.thumbnail_store)
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_store, self.root)
+        self.memory.register("thumbnail_cache", self.thumbnail_loader.memory, priority=1)
 
     def _get_base_dir(self):
         if getattr(sys, 'frozen', False):
@@ -63,6 +242,41 @@ class MojistApp:
         else:
             return Path(__file__).resolve().parent
 
+    def _query_font_families(self):
+        families = sorted(f for f in tkfont.families() if "@" not in f)
+        self.font_family_cache.save(families)
+        return families
+
+    def _refresh_font_list(self):
+        families = self._query_font_families()
+        if families != self.font_list:
+            self.font_list = families
+            self.font_prefix_index = FamilyPrefixIndex(families)
+            if self.font_feed_job:
+                self.root.after_cancel(self.font_feed_job)
+            self._feed_font_combo()
+
+    def _feed_font_combo(self, count=0):
+        count = min(count + 500, len(self.font_list))
+        self.font_combo.config(values=self.font_list[:count])
+        if count < len(self.font_list):
+            self.font_feed_job = self.root.after_idle(self._feed_font_combo, count)
+        else:
+            self.font_feed_job = None
+
+    def _on_font_typeahead(self, event):
+        if not event.char or not event.char.isprintable():
+            return None
+        if event.time - self.font_typeahead_time > 1000:
+            self.font_typeahead = ""
+        self.font_typeahead += event.char
+        self.font_typeahead_time = event.time
+        match = self.font_prefix_index.first(self.font_typeahead)
+        if match and match != self.selected_font_name:
+            self.font_combo.set(match)
+            self.change_font()
+        return "break"
+
     def _get_initial_font(self):
         preferred_fonts = ["Meiryo", "MS UI Gothic", "Yu Gothic UI", "MS Gothic"]
         return next((f for f in preferred_fonts if f in self.font_list), self.font_list[0])
@@ -72,19 +286,26 @@ class MojistApp:
         self.root.geometry("1024x640")
         self.root.resizable(False, False)
         self.root.bind("<Button-1>", self._on_window_click)
+        self.root.bind("<F12>", lambda e: self.open_trace_window())
+        self.pixels_per_point = self.root.winfo_fpixels("1p")
 
     def _load_initial_image(self):
         image_path = self.BG_FOLDER / "P000.png"
-        try:
-            if image_path.exists():
-                self.apply_background_image(image_path)
-            else:
-                raise FileNotFoundError("初期画像が存在しません。")
-        except Exception as e:
-            print(f"初期画像読み込み失敗: {e}")
-            self.image = Image.new("RGB", (1024, 576), color=(128, 128, 128))
-            self.photo = ImageTk.PhotoImage(self.image)
-            self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        if image_path.exists():
+            self.image_path = image_path
+            self.bg_cache.request(image_path, self._on_initial_background)
+        else:
+            self._on_initial_background(None, FileNotFoundError("初期画像が存在しません。"))
+
+    def _on_initial_background(self, decoded, error):
+        if self.image is None:
+            if error is not None:
+                print(f"初期画像読み込み失敗: {error}")
+                decoded = self._blank_background()
+            self._set_background(decoded)
+            self.canvas.config(bg="white")
+            self.history.amend(self._history_state())
+        self._startup_mark("background")
 
     def _create_widgets(self):
         control_area = tk.Frame(self.root)
@@ -97,10 +318,17 @@ class MojistApp:
         self.input_text.pack(side=tk.LEFT, expand=True, fill=tk.X)
         self.input_text.bind("<Return>", lambda event: self.toggle_fixed_text())
 
-        self.font_combo = ttk.Combobox(top_frame, values=self.font_list, state="readonly", width=20)
+        self.font_combo = ttk.Combobox(top_frame, values=[], state="readonly", width=20)
         self.font_combo.set(self.selected_font_name)
         self.font_combo.pack(side=tk.LEFT, padx=(10, 0))
         self.font_combo.bind("<<ComboboxSelected>>", self.change_font)
+        self.font_combo.bind("<KeyPress>", self._on_font_typeahead)
+
+        self.layer_combo = ttk.Combobox(top_frame, values=[], state="readonly", width=14)
+        self.layer_combo.pack(side=tk.LEFT, padx=(10, 0))
+        self.layer_combo.bind("<<ComboboxSelected>>", lambda e: self._select_layer(self.layer_combo.current()))
+        tk.Button(top_frame, text="＋", width=2, command=self._add_layer).pack(side=tk.LEFT, padx=(5, 0))
+        tk.Button(top_frame, text="－", width=2, command=self._remove_layer).pack(side=tk.LEFT)
         
         bottom_frame = tk.Frame(control_area)
         bottom_frame.pack(fill=tk.X, pady=(5, 0))
@@ -121,39 +349,284 @@ class MojistApp:
         separator3.pack(side=tk.LEFT, fill='y', padx=10, pady=5)
         tk.Button(bottom_frame, text="保存", command=self._save_project).pack(side=tk.LEFT)
         tk.Button(bottom_frame, text="呼び出し", command=self._load_project).pack(side=tk.LEFT, padx=5)
-
-        self.canvas = tk.Canvas(self.root, bg="white", highlightthickness=0)
+        tk.Button(bottom_frame, text="ライブラリ", command=self.open_project_library).pack(side=tk.LEFT)
+        tk.Button(bottom_frame, text="書き出し", command=self.open_export_window).pack(side=tk.LEFT, padx=5)
+        self.redo_button = tk.Button(bottom_frame, text="やり直し", command=self.redo, state=tk.DISABLED)
+        self.redo_button.pack(side=tk.RIGHT)
+        self.undo_button = tk.Button(bottom_frame, text="元に戻す", command=self.undo, state=tk.DISABLED)
+        self.undo_button.pack(side=tk.RIGHT, padx=5)
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-Z>", lambda e: self.redo())
+        for key, dx, dy in (("Left", -1, 0), ("Right", 1, 0), ("Up", 0, -1), ("Down", 0, 1)):
+            self.root.bind(f"<KeyPress-{key}>", lambda e, dx=dx, dy=dy: self._on_arrow_key(e, dx, dy))
+            self.root.bind(f"<KeyRelease-{key}>", self._on_arrow_release)
+
+        self.canvas = tk.Canvas(self.root, bg="#808080", highlightthickness=0)
         self.canvas.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
         self.canvas_image = self.canvas.create_image(0, 0, anchor=tk.NW)
+        self.canvas.bind("<ButtonPress-1>", self._start_drag)
+        self.canvas.bind("<B1-Motion>", self._drag_text)
+        self.canvas.bind("<ButtonRelease-1>", self._end_drag)
+        self.canvas.bind("<Motion>", self._update_drag_cursor)
+
+    @traced("update_text")
+    def update_text(self, layer=None):
+        self._request_layer("render", layer)
+
+    def _request_layer(self, kind, layer=None):
+        self.redraw.request((kind, layer or self.layers.active))
+
+    def _redraw_all(self):
+        self.redraw.request("background", *(("render", layer) for layer in self.layers))
+
+    @traced("redraw")
+    def _apply_redraw(self, changes):
+        if "background" in changes:
+            self.canvas.itemconfig(self.canvas_image, image=self.photo)
+            previous, self.shown_background = self.shown_background, self.background
+            if previous is not None and previous is not self.background and previous.evicted:
+                self._release_background_photo(previous)
+
+        dirty = {}
+        for change in changes:
+            if isinstance(change, tuple):
+                kind, layer = change
+                dirty.setdefault(layer, set()).add(kind)
+        for layer, kinds in dirty.items():
+            if layer not in self.layers:
+                continue
+            if "render" in kinds or layer.origin is None:
+                self.draw_text(layer)
+                continue
+            if "color" in kinds:
+                self._recolor_text(layer)
+            if "position" in kinds:
+                ox, oy = layer.origin
+                self.canvas.move(layer.tag, layer.x - ox, layer.y - oy)
+                layer.origin = (layer.x, layer.y)
+        if tracer.enabled:
+            self._sample_trace_counters()
+
+    def _current_text(self, layer):
+        if layer.text:
+            return layer.text
+        if layer is self.layers.active:
+            return self.input_text.get() or "文字"
+        return "文字"
+
+    @traced("draw_text")
+    def draw_text(self, layer):
+        text = self._current_text(layer)
+        font = None
+        if font_index_ready():
+            font = load_font(layer.font_name, self._font_pixel_size(layer.font_size))
+        if font is None:
+            self.canvas.delete(layer.tag)
+            layer.forget_render()
+            layer.origin = (layer.x, layer.y)
+            self._draw_text_items(layer, text)
+            self._restack_layer(layer)
+            self._startup_mark("first_text")
+            return
 
-    def update_text(self):
-        self.canvas.itemconfig(self.canvas_image, image=self.photo)
-        self.canvas.delete("text")
-        main_text = self.fixed_text if self.fixed_text else self.input_text.get() or "文字"
-        self.draw_text(self.x, self.y, main_text)
+        key = layer.style_key(text)
+        rendered = self.text_cache.get(key)
+        if rendered is None:
+            rendered = render_text_sprite(
+                text, font, layer.text_color, layer.outline_color, layer.outline_width, layer.effects
+            )
+            self._cache_rendered_text(key, rendered)
+        layer.origin = (layer.x, layer.y)
+        self._show_rendered_text(layer, text, rendered)
+        self._startup_mark("first_text")
+
+    def _recolor_text(self, layer):
+        if layer.sprite is None:
+            self.canvas.itemconfig(f"{layer.tag}_outline", fill=layer.outline_color)
+            self.canvas.itemconfig(f"{layer.tag}_fill", fill=layer.text_color)
+            return
 
-    def draw_text(self, x, y, text):
-        font_tuple = (self.selected_font_name, self.font_size, "bold")
-        offset = self.outline_width
+        text = layer.sprite_text
+        key = layer.style_key(text)
+        rendered = self.text_cache.get(key)
+        if rendered is None:
+            sprite = layer.sprite
+            rendered = RenderedText(sprite, sprite.compose(layer.text_color, layer.outline_color, layer.effects))
+            self._cache_rendered_text(key, rendered)
+        self._show_rendered_text(layer, text, rendered)
+
+    def _cache_rendered_text(self, key, rendered):
+        rendered.photo = ImageTk.PhotoImage(rendered.image)
+        self.text_cache.put(key, rendered)
+
+    def _show_rendered_text(self, layer, text, rendered):
+        left, top, _, _ = rendered.sprite.bbox(*layer.origin)
+        if layer.item is None:
+            self.canvas.delete(layer.tag)
+            layer.item = self.canvas.create_image(left, top, anchor=tk.NW, image=rendered.photo, tags=layer.tag)
+            self._restack_layer(layer)
+        else:
+            self.canvas.coords(layer.item, left, top)
+            self.canvas.itemconfig(layer.item, image=rendered.photo)
+        layer.photo = rendered.photo
+        layer.sprite = rendered.sprite
+        layer.sprite_text = text
+
+    def _restack_layer(self, layer):
+        for above in self.layers.above(layer):
+            if self.canvas.find_withtag(above.tag):
+                self.canvas.tag_lower(layer.tag, above.tag)
+                return
+
+    def _font_pixel_size(self, size):
+        return max(1, round(size * self.pixels_per_point))
+
+    def _draw_text_items(self, layer, text):
+        x, y = layer.origin
+        font_tuple = (layer.font_name, layer.font_size, "bold")
+        offset = min(layer.outline_width, TK_OUTLINE_LIMIT)
 
         if offset > 0:
             for dx in range(-offset, offset + 1):
                 for dy in range(-offset, offset + 1):
                     if dx**2 + dy**2 <= offset**2:
-                        self.canvas.create_text(x + dx, y + dy, text=text, font=font_tuple, fill=self.outline_color, tags="text")
+                        self.canvas.create_text(x + dx, y + dy, text=text, font=font_tuple, fill=layer.outline_color, tags=(layer.tag, f"{layer.tag}_outline"))
                         
-        self.canvas.create_text(x, y, text=text, font=font_tuple, fill=self.text_color, tags="text")
+        self.canvas.create_text(x, y, text=text, font=font_tuple, fill=layer.text_color, tags=(layer.tag, f"{layer.tag}_fill"))
+
+    def _layer_label(self, index, layer):
+        text = layer.text or (self.input_text.get() if layer is self.layers.active else "") or "文字"
+        if len(text) > 8:
+            text = text[:8] + "..."
+        return f"{index + 1}: {text}"
+
+    def _refresh_layer_combo(self):
+        self.layer_combo.config(values=[self._layer_label(i, layer) for i, layer in enumerate(self.layers)])
+        self.layer_combo.current(self.layers.active_index)
+
+    def _show_active_layer(self):
+        self.input_text.delete(0, tk.END)
+        self.input_text.insert(0, self.fixed_text or "")
+        self.font_combo.set(self.selected_font_name)
+        self._refresh_layer_combo()
+
+    def _keep_typed_text(self):
+        if not self.fixed_text:
+            self.fixed_text = self.input_text.get() or None
+
+    def _select_layer(self, index):
+        if index < 0 or index == self.layers.active_index:
+            return
+        self._keep_typed_text()
+        self.layers.active_index = index
+        self._show_active_layer()
+
+    def _add_layer(self):
+        self._keep_typed_text()
+        style = self.layers.active.to_dict()
+        style.update(text=None, y=max(style["y"] - 80, 40))
+        layer = self.layers.add(TextLayer(**style))
+        self._show_active_layer()
+        self.update_text(layer)
+        self._commit_history()
+        self.input_text.focus_set()
+
+    def _remove_layer(self):
+        layer = self.layers.active
+        if not self.layers.remove(layer):
+            return
+        self.canvas.delete(layer.tag)
+        self._show_active_layer()
+        self._commit_history()
+
+    def _replace_layers(self, layers):
+        for layer in self.layers:
+            self.canvas.delete(layer.tag)
+        self.layers = LayerStack(layers)
+        self._show_active_layer()
+        self._redraw_all()
+
+    def _history_state(self):
+        state = {("background",): self.background, ("order",): tuple(layer.id for layer in self.layers)}
+        for layer in self.layers:
+            for field, value in layer.to_dict().items():
+                state[(layer.id, field)] = value
+        return state
+
+    def _commit_history(self, group=None):
+        if self.history.commit(self._history_state(), group):
+            self._update_history_buttons()
+
+    def _update_history_buttons(self):
+        self.undo_button.config(state=tk.NORMAL if self.history.can_undo() else tk.DISABLED)
+        self.redo_button.config(state=tk.NORMAL if self.history.can_redo() else tk.DISABLED)
+
+    def undo(self):
+        state = self.history.undo()
+        if state is not None:
+            self._restore_history_state(state)
+
+    def redo(self):
+        state = self.history.redo()
+        if state is not None:
+            self._restore_history_state(state)
+
+    def _restore_history_state(self, state):
+        decoded = state[("background",)]
+        if decoded is not self.background and decoded is not None:
+            if decoded.path:
+                self.image_path = decoded.path
+            self._set_background(decoded)
+
+        active = self.layers.active
+        existing = {layer.id: layer for layer in self.layers}
+        layers = []
+        for layer_id in state[("order",)]:
+            layer = existing.pop(layer_id, None)
+            if layer is None:
+                layer = TextLayer(layer_id=layer_id)
+                changed = set(LAYER_FIELDS)
+            else:
+                changed = set()
+            for field in LAYER_FIELDS:
+                value = state[(layer_id, field)]
+                if getattr(layer, field) != value:
+                    setattr(layer, field, value)
+                    changed.add(field)
+            layers.append(layer)
+            if changed <= {"x", "y"}:
+                if changed:
+                    self._request_layer("position", layer)
+            elif changed <= {"x", "y", "text_color", "outline_color"}:
+                self._request_layer("color", layer)
+                self._request_layer("position", layer)
+            else:
+                self.update_text(layer)
+        for layer in existing.values():
+            self.canvas.delete(layer.tag)
+
+        self.layers.layers = layers
+        self.layers.active_index = next(
+            (i for i, layer in enumerate(layers) if layer is active),
+            min(self.layers.active_index, len(layers) - 1)
+        )
+        self._show_active_layer()
+        self._update_history_buttons()
 
     def toggle_fixed_text(self):
         self.fixed_text = self.input_text.get()
         self.update_text()
+        self._refresh_layer_combo()
+        self._commit_history()
 
     def change_font(self, event=None):
         self.selected_font_name = self.font_combo.get()
         self.update_text()
+        self._commit_history()
         
     def _on_window_click(self, event):
-        if event.widget not in (self.input_text, self.font_combo):
+        if event.widget not in (self.input_text, self.font_combo, self.layer_combo, self.canvas):
             self.root.focus_set()
 
     def register_preset(self):
@@ -168,6 +641,8 @@ class MojistApp:
         if self.preset_text:
             self.fixed_text = self.preset_text
             self.update_text()
+            self._show_active_layer()
+            self._commit_history()
 
     def show_preset(self):
         display_text = self.preset_text if self.preset_text else "プリセットなし"
@@ -212,17 +687,23 @@ class MojistApp:
             return
 
         self.adjust_x, self.adjust_y = self.x, self.y
+        self.adjust_history_mark = self.history.mark()
+        self.history.break_group()
         self.adjust_initial_font_size = self.font_size
         self.adjust_initial_text_color = self.text_color
         self.adjust_initial_outline_color = self.outline_color
         self.adjust_initial_outline_width = self.outline_width
+        self.adjust_initial_effects = self.effects
 
         self.adjust_window = tk.Toplevel(self.root)
         self.adjust_window.title("総合調整")
-        self.adjust_window.geometry("400x300")
+        self.adjust_window.geometry("420x330")
         self.adjust_window.resizable(False, False)
         self.adjust_window.protocol("WM_DELETE_WINDOW", self._cancel_adjustments)
         self.adjust_window.grab_set()
+        for key, dx, dy in (("Left", -1, 0), ("Right", 1, 0), ("Up", 0, -1), ("Down", 0, 1)):
+            self.adjust_window.bind(f"<KeyPress-{key}>", lambda e, dx=dx, dy=dy: self._on_arrow_key(e, dx, dy))
+            self.adjust_window.bind(f"<KeyRelease-{key}>", self._on_arrow_release)
 
         main_pane = tk.Frame(self.adjust_window)
         main_pane.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
@@ -238,12 +719,14 @@ class MojistApp:
         tk.Button(left_frame, text="サイズ調整", command=lambda: self._switch_adjust_panel("size")).pack(fill=tk.X, pady=5, padx=5)
         tk.Button(left_frame, text="色の調整", command=lambda: self._switch_adjust_panel("color")).pack(fill=tk.X, pady=5, padx=5)
         tk.Button(left_frame, text="縁の調整", command=lambda: self._switch_adjust_panel("outline")).pack(fill=tk.X, pady=5, padx=5)
+        tk.Button(left_frame, text="効果", command=lambda: self._switch_adjust_panel("effects")).pack(fill=tk.X, pady=5, padx=5)
 
         self.adjust_panels = {
             "position": self._create_position_panel(self.right_frame),
             "size": self._create_size_panel(self.right_frame),
             "color": self._create_color_panel(self.right_frame),
-            "outline": self._create_outline_panel(self.right_frame)
+            "outline": self._create_outline_panel(self.right_frame),
+            "effects": self._create_effects_panel(self.right_frame)
         }
         
         button_frame = tk.Frame(self.adjust_window)
@@ -316,8 +799,6 @@ class MojistApp:
         return panel
 
     def _create_color_panel(self, parent):
-        from tkinter.colorchooser import askcolor
-
         panel = tk.Frame(parent, padx=10, pady=10)
 
         text_color_frame = tk.Frame(panel)
@@ -345,7 +826,7 @@ class MojistApp:
         self.outline_width_label.pack(side=tk.LEFT)
 
         width_scale = tk.Scale(
-            panel, from_=0, to=10,
+            panel, from_=0, to=40,
             orient=tk.HORIZONTAL,
             showvalue=0,
             command=self._change_outline_width_from_slider
@@ -358,7 +839,133 @@ class MojistApp:
         new_width = int(float(new_width_str))
         self.outline_width = new_width
         self.outline_width_label.config(text=str(new_width))
-        self.update_text()
+        self._request_layer("render")
+        self._commit_history("outline_width")
+
+    def _create_effects_panel(self, parent):
+        panel = tk.Frame(parent, padx=10, pady=5)
+
+        self.effect_listbox = tk.Listbox(panel, height=4, exportselection=False)
+        self.effect_listbox.pack(fill=tk.X)
+        self.effect_listbox.bind("<<ListboxSelect>>", lambda e: self._show_effect_controls())
+
+        button_frame = tk.Frame(panel)
+        button_frame.pack(fill=tk.X, pady=5)
+        tk.Button(button_frame, text="縁を追加", command=lambda: self._add_effect("stroke")).pack(side=tk.LEFT)
+        tk.Button(button_frame, text="影を追加", command=lambda: self._add_effect("shadow")).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="色", command=self._choose_effect_color).pack(side=tk.LEFT)
+        tk.Button(button_frame, text="削除", command=self._remove_effect).pack(side=tk.LEFT, padx=5)
+
+        self.effect_size_label = tk.Label(panel, text="", anchor=tk.W)
+        self.effect_size_label.pack(fill=tk.X)
+        self.effect_size_scale = tk.Scale(
+            panel, from_=0, to=60,
+            orient=tk.HORIZONTAL,
+            showvalue=0,
+            command=self._change_effect_size
+        )
+        self.effect_size_scale.pack(fill=tk.X)
+        self.effect_distance_label = tk.Label(panel, text="", anchor=tk.W)
+        self.effect_distance_label.pack(fill=tk.X)
+        self.effect_distance_scale = tk.Scale(
+            panel, from_=0, to=40,
+            orient=tk.HORIZONTAL,
+            showvalue=0,
+            command=self._change_effect_distance
+        )
+        self.effect_distance_scale.pack(fill=tk.X)
+
+        self._refresh_effect_list(0)
+        return panel
+
+    def _selected_effect_index(self):
+        selection = self.effect_listbox.curselection()
+        return selection[0] if selection else None
+
+    def _refresh_effect_list(self, select=None):
+        self.effect_listbox.delete(0, tk.END)
+        for effect in self.effects:
+            self.effect_listbox.insert(tk.END, effect_label(effect))
+        if self.effects and select is not None:
+            select = min(select, len(self.effects) - 1)
+            self.effect_listbox.selection_set(select)
+            self.effect_listbox.see(select)
+        self._show_effect_controls()
+
+    def _show_effect_controls(self):
+        index = self._selected_effect_index()
+        effect = self.effects[index] if index is not None else None
+        if effect is None:
+            self.effect_size_label.config(text="効果を追加・選択してください")
+            self.effect_distance_label.config(text="")
+            self.effect_size_scale.config(state=tk.DISABLED)
+            self.effect_distance_scale.config(state=tk.DISABLED)
+            return
+        self.effect_size_scale.config(state=tk.NORMAL)
+        if effect["type"] == "stroke":
+            self.effect_size_label.config(text=f"太さ: {effect['width']}")
+            self.effect_size_scale.set(effect["width"])
+            self.effect_distance_label.config(text="")
+            self.effect_distance_scale.config(state=tk.DISABLED)
+        else:
+            self.effect_size_label.config(text=f"ぼかし: {effect['blur']:g}")
+            self.effect_size_scale.set(effect["blur"])
+            self.effect_distance_label.config(text=f"距離: {effect['dx']}")
+            self.effect_distance_scale.config(state=tk.NORMAL)
+            self.effect_distance_scale.set(effect["dx"])
+
+    def _replace_effect(self, index, **changes):
+        effect = dict(self.effects[index])
+        effect.update(changes)
+        if effect == self.effects[index]:
+            return False
+        self.effects = self.effects[:index] + (effect,) + self.effects[index + 1:]
+        return True
+
+    def _effects_changed(self, select=None, group=None):
+        self._refresh_effect_list(select)
+        self._request_layer("render")
+        self._commit_history(group)
+
+    def _add_effect(self, kind):
+        effect = dict(EFFECT_DEFAULTS[kind], type=kind)
+        self.effects = self.effects + (effect,)
+        self.history.break_group()
+        self._effects_changed(len(self.effects) - 1)
+
+    def _remove_effect(self):
+        index = self._selected_effect_index()
+        if index is None:
+            return
+        self.effects = self.effects[:index] + self.effects[index + 1:]
+        self.history.break_group()
+        self._effects_changed(index)
+
+    def _change_effect_size(self, value):
+        index = self._selected_effect_index()
+        if index is None:
+            return
+        field = "width" if self.effects[index]["type"] == "stroke" else "blur"
+        if self._replace_effect(index, **{field: int(float(value))}):
+            self._effects_changed(index, "effect_size")
+
+    def _change_effect_distance(self, value):
+        index = self._selected_effect_index()
+        if index is None or self.effects[index]["type"] != "shadow":
+            return
+        distance = int(float(value))
+        if self._replace_effect(index, dx=distance, dy=distance):
+            self._effects_changed(index, "effect_distance")
+
+    def _choose_effect_color(self):
+        from tkinter.colorchooser import askcolor
+        index = self._selected_effect_index()
+        if index is None:
+            return
+        color_code = askcolor(title="効果の色を選択", initialcolor=self.effects[index]["color"])
+        if color_code[1] and self._replace_effect(index, color=color_code[1]):
+            self.history.break_group()
+            self._effects_changed(index)
 
     def _choose_text_color(self):
         from tkinter.colorchooser import askcolor
@@ -366,7 +973,8 @@ class MojistApp:
         if color_code[1]:
             self.text_color = color_code[1]
             self.text_color_preview.config(bg=self.text_color)
-            self.update_text()
+            self._request_layer("color")
+            self._commit_history()
 
     def _choose_outline_color(self):
         from tkinter.colorchooser import askcolor
@@ -374,32 +982,105 @@ class MojistApp:
         if color_code[1]:
             self.outline_color = color_code[1]
             self.outline_color_preview.config(bg=self.outline_color)
-            self.update_text()
+            self._request_layer("color")
+            self._commit_history()
+
+    def _layer_bbox(self, layer):
+        if layer.sprite is not None and layer.origin is not None:
+            return layer.sprite.bbox(*layer.origin)
+        return self.canvas.bbox(layer.tag)
+
+    def _layer_at(self, x, y):
+        for layer in reversed(self.layers.layers):
+            box = self._layer_bbox(layer)
+            if box and box[0] <= x < box[2] and box[1] <= y < box[3]:
+                return layer
+        return None
+
+    def _update_drag_cursor(self, event):
+        cursor = "fleur" if self._layer_at(event.x, event.y) is not None else ""
+        if cursor != self.drag_cursor:
+            self.drag_cursor = cursor
+            self.canvas.config(cursor=cursor)
+
+    def _start_drag(self, event):
+        self.canvas.focus_set()
+        layer = self._layer_at(event.x, event.y)
+        if layer is None:
+            self.drag = None
+            return
+        self._select_layer(self.layers.index(layer))
+        self.history.break_group()
+        self.drag = (layer, event.x, event.y, layer.x, layer.y)
+
+    def _drag_text(self, event):
+        if self.drag is None:
+            return
+        layer, start_x, start_y, x, y = self.drag
+        layer.x = x + event.x - start_x
+        layer.y = y + event.y - start_y
+        self._request_layer("position", layer)
 
-    def _move_text(self, dx, dy):
-        step = self.adjust_step.get()
+    def _end_drag(self, event):
+        if self.drag is None:
+            return
+        self._drag_text(event)
+        self.drag = None
+        self._commit_history()
+
+    def _on_arrow_key(self, event, dx, dy):
+        if isinstance(event.widget, (tk.Entry, tk.Listbox, tk.Scale, ttk.Entry)):
+            return None
+        now = time.perf_counter()
+        if self.nudge_release_job is not None:
+            self.root.after_cancel(self.nudge_release_job)
+            self.nudge_release_job = None
+        if event.keysym != self.nudge_key or now - self.nudge_last > self.history.coalesce_seconds:
+            self.nudge_started = now
+            self.history.break_group()
+        self.nudge_key = event.keysym
+        self.nudge_last = now
+        base = self.adjust_step.get() * (10 if event.state & SHIFT_MASK else 1)
+        self._move_text(dx, dy, base * _acceleration(now - self.nudge_started))
+        return "break"
+
+    def _on_arrow_release(self, event):
+        if self.nudge_key is not None and self.nudge_release_job is None:
+            self.nudge_release_job = self.root.after(NUDGE_RELEASE_MS, self._end_nudge)
+
+    def _end_nudge(self):
+        self.nudge_release_job = None
+        self.nudge_key = None
+        self.history.break_group()
+
+    def _move_text(self, dx, dy, step):
         self.x += dx * step
         self.y += dy * step
-        self.update_text()
+        self._request_layer("position")
+        self._commit_history("move")
     
     def _start_move(self, dx, dy):
-        self._move_text(dx, dy)
-        self.repeat_job = self.root.after(500, self._repeat_move, dx, dy)
+        self.move_started = time.perf_counter()
+        self._move_text(dx, dy, self.adjust_step.get())
+        self.repeat_job = self.root.after(MOVE_REPEAT_DELAY_MS, self._repeat_move, dx, dy)
 
     def _repeat_move(self, dx, dy):
-        self._move_text(dx, dy)
-        self.repeat_job = self.root.after(100, self._repeat_move, dx, dy)
+        held = time.perf_counter() - self.move_started
+        self._move_text(dx, dy, self.adjust_step.get() * _acceleration(held))
+        self.repeat_job = self.root.after(MOVE_REPEAT_MS, self._repeat_move, dx, dy)
 
     def _stop_move(self, event):
         if self.repeat_job:
             self.root.after_cancel(self.repeat_job)
             self.repeat_job = None
+        self.history.break_group()
 
     def _change_font_size_from_slider(self, new_size_str):
         new_size = int(float(new_size_str))
         self.font_size = new_size
         self.size_value_label.config(text=str(new_size))
-        self.update_text()
+        self._request_layer("render")
+        self._commit_history("font_size")
 
     def _confirm_adjustments(self):
         if self.adjust_window and self.adjust_window.winfo_exists():
@@ -413,14 +1094,20 @@ class MojistApp:
         self.text_color = self.adjust_initial_text_color
         self.outline_color = self.adjust_initial_outline_color
         self.outline_width = self.adjust_initial_outline_width
+        self.effects = self.adjust_initial_effects
 
         self.update_text()
+        self.history.rollback(self.adjust_history_mark, self._history_state())
+        self._update_history_buttons()
         self._confirm_adjustments()
 
     def open_background_selector(self):
         if self.background_selector_window and self.background_selector_window.winfo_exists():
             self.background_selector_window.lift()
             return
+        from mojist.gallery import VirtualGallery
+
+        self._ensure_bg_services()
 
         self.background_selector_window = tk.Toplevel(self.root)
         self.background_selector_window.title("背景変更")
@@ -430,72 +1117,57 @@ class MojistApp:
         self.background_selector_window.grab_set()
 
         control_frame = tk.Frame(self.background_selector_window)
-        control_frame.pack(pady=5)
-        tk.Button(control_frame, text="←", command=lambda: self._change_bg_page(-1)).pack(side=tk.LEFT)
-        self.page_label = tk.Label(control_frame, text="1 / 1")
-        self.page_label.pack(side=tk.LEFT, padx=10)
-        tk.Button(control_frame, text="→", command=lambda: self._change_bg_page(1)).pack(side=tk.LEFT)
-
-        tk.Button(self.background_selector_window, text="🔄 再読み込み", command=lambda: self._draw_bg_page(force_reload=True)).pack(pady=5)
-        
-        self.grid_frame = tk.Frame(self.background_selector_window)
-        self.grid_frame.pack()
-
-        tk.Button(self.background_selector_window, text="決定", command=self._apply_background_selection).pack(side=tk.RIGHT, padx=10, pady=10)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        tk.Label(control_frame, text="絞り込み:").pack(side=tk.LEFT)
+        self.bg_filter_var = tk.StringVar()
+        self.bg_filter_var.trace_add("write", lambda *args: self.bg_gallery.set_filter(self.bg_filter_var.get()))
+        tk.Entry(control_frame, textvariable=self.bg_filter_var, width=25).pack(side=tk.LEFT, padx=5)
+        tk.Button(control_frame, text="🔄 再読み込み", command=lambda: self._draw_bg_page(force_reload=True)).pack(side=tk.RIGHT)
+
+        tk.Button(self.background_selector_window, text="決定", command=self._apply_background_selection).pack(side=tk.BOTTOM, anchor=tk.E, padx=10, pady=10)
+
+        self.bg_gallery = VirtualGallery(
+            self.background_selector_window, self.thumbnail_loader, self.THUMBNAIL_SIZE,
+            columns=3, on_select=self._select_bg
+        )
+        self.bg_gallery.pack(expand=True, fill=tk.BOTH, padx=10)
 
         self._draw_bg_page(force_reload=True)
 
+    @traced("draw_bg_page")
     def _draw_bg_page(self, force_reload=False):
         if force_reload:
-            self.bg_image_files = sorted([f for f in self.BG_FOLDER.iterdir() if f.suffix.lower() in (".png", ".jpg", ".jpeg")])
-            self.bg_total_pages = (len(self.bg_image_files) - 1) // self.THUMBS_PER_PAGE + 1
-            if self.bg_total_pages == 0: self.bg_total_pages = 1
-            self.bg_current_page = min(self.bg_current_page, self.bg_total_pages - 1)
-
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-        self.bg_thumbs.clear()
-
-        start = self.bg_current_page * self.THUMBS_PER_PAGE
-        end = start + self.THUMBS_PER_PAGE
-        for i, img_path in enumerate(self.bg_image_files[start:end]):
-            try:
-                img = Image.open(img_path).resize(self.THUMBNAIL_SIZE)
-                thumb = ImageTk.PhotoImage(img)
-                self.bg_thumbs.append(thumb)
-            except Exception as e:
-                print(f"サムネイル生成失敗: {img_path.name}\n{traceback.format_exc()}")
-                continue
-
-            frame = tk.Frame(self.grid_frame, bd=2, relief="solid", highlightthickness=0)
-            if self.bg_selected_index == start + i:
-                frame.config(highlightbackground="#008000", highlightthickness=2)
+            if self.bg_watcher is None:
+                from mojist.watch import create_watcher
+                self.bg_watcher = create_watcher([self.BG_FOLDER])
+                changed = None
+            else:
+                changed = self.bg_watcher.poll()
+            self.bg_index.refresh(changed)
+            self.bg_index.save()
+            self.bg_image_files = self.bg_index.paths()
+            self.bg_gallery.set_items(self.bg_image_files)
+
+        position = self.bg_index.position(self.bg_selected_id)
+        self.bg_gallery.select(position)
+        if position is not None:
+            self.bg_gallery.update_idletasks()
+            self.bg_gallery.see(position)
 
-            img_label = tk.Label(frame, image=thumb, cursor="hand2")
-            img_label.pack()
-            tk.Label(frame, text=img_path.name, wraplength=self.THUMBNAIL_SIZE[0]).pack()
-            frame.grid(row=i // 3, column=i % 3, padx=5, pady=5)
-            
-            img_label.bind("<Button-1>", lambda e, idx=start + i: self._select_bg(idx))
-        
-        self.page_label.config(text=f"{self.bg_current_page + 1} / {self.bg_total_pages}")
-    
     def _select_bg(self, index):
-        self.bg_selected_index = index
-        self._draw_bg_page()
-
-    def _change_bg_page(self, delta):
-        new_page = self.bg_current_page + delta
-        if 0 <= new_page < self.bg_total_pages:
-            self.bg_current_page = new_page
-            self._draw_bg_page()
+        entry = self.bg_index.entries()[index]
+        self.bg_selected_id = entry.id
+        self.bg_cache.preload(entry.path)
 
     def _apply_background_selection(self):
-        if self.bg_selected_index is not None:
-            selected_file_path = self.bg_image_files[self.bg_selected_index]
+        entry = self.bg_index.get(self.bg_selected_id)
+        if entry is not None:
+            selected_file_path = entry.path
             try:
                 self.apply_background_image(selected_file_path)
+                self._commit_history()
             except Exception as e:
+                import traceback
                 print(f"背景画像の適用に失敗しました: {e}\n{traceback.format_exc()}")
         self._close_background_selector()
 
@@ -504,17 +1176,19 @@ class MojistApp:
             self.background_selector_window.grab_release()
             self.background_selector_window.destroy()
         self.background_selector_window = None
+        self.thumbnail_loader.cancel_pending()
+        self.bg_gallery = None
 
+    @traced("apply_background_image")
     def apply_background_image(self, path):
         from tkinter import messagebox
 
         self.image_path = path
 
         try:
-            self.image = Image.open(path).resize((1024, 576))
-            self.photo = ImageTk.PhotoImage(self.image)
-            self.update_text()
+            self._set_background(self.bg_cache.get(path))
         except Exception as e:
+            import traceback
             error_detail = traceback.format_exc()
             messagebox.showerror(
                 "画像読み込みエラー",
@@ -522,22 +1196,41 @@ class MojistApp:
             )
             print(error_detail)
 
-            self.image = Image.new("RGB", (1024, 576), color=(128, 128, 128))
-            self.photo = ImageTk.PhotoImage(self.image)
-            self.update_text()
+            self._set_background(self._blank_background())
+
+    def _blank_background(self):
+        decoded = DecodedBackground(None, Image.new("RGB", (1024, 576), color=(128, 128, 128)))
+        decoded.photo = ImageTk.PhotoImage(decoded.image)
+        return decoded
+
+    def _set_background(self, decoded):
+        if decoded.photo is None:
+            decoded.photo = ImageTk.PhotoImage(decoded.image)
+        self.background = decoded
+        self.image = decoded.image
+        self.photo = decoded.photo
+        self.redraw.request("background")
+
+    def _project_data(self):
+        layers = []
+        for layer in self.layers:
+            layer_data = layer.to_dict()
+            layer_data["text"] = self.input_text.get() if layer is self.layers.active else layer.text or ""
+            layers.append(layer_data)
+
+        project_data = dict(layers[0])
+        project_data.update({
+            "background_image_path": str(getattr(self, 'image_path', '')),
+            "pixels_per_point": self.pixels_per_point,
+            "canvas_size": list(PREVIEW_SIZE),
+            "layers": layers
+        })
+        return project_data
 
     def _save_project(self):
-        project_data = {
-            "text": self.input_text.get(),
-            "font_name": self.selected_font_name,
-            "font_size": self.font_size,
-            "text_color": self.text_color,
-            "outline_color": self.outline_color,
-            "outline_width": self.outline_width,
-            "x": self.x,
-            "y": self.y,
-            "background_image_path": str(getattr(self, 'image_path', ''))
-        }
+        from tkinter import filedialog, messagebox
+
+        project_data = self._project_data()
 
         file_path = filedialog.asksaveasfilename(
             initialdir=self.PROJECTS_FOLDER,
@@ -550,13 +1243,93 @@ class MojistApp:
             return
 
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(project_data, f, ensure_ascii=False, indent=4)
+            self._write_project_file(file_path, project_data)
             messagebox.showinfo("保存完了", f"プロジェクトを保存しました。\n{Path(file_path).name}")
         except Exception as e:
             messagebox.showerror("保存エラー", f"プロジェクトの保存に失敗しました。\n\n詳細: {e}")
 
+    def open_export_window(self):
+        if self.export_window and self.export_window.winfo_exists():
+            self.export_window.lift()
+            return
+
+        self.export_window = tk.Toplevel(self.root)
+        self.export_window.title("画像の書き出し")
+        self.export_window.resizable(False, False)
+        self.export_window.protocol("WM_DELETE_WINDOW", self._close_export_window)
+
+        tk.Label(self.export_window, text="出力サイズ:").pack(padx=20, pady=(10, 0), anchor=tk.W)
+        size_combo = ttk.Combobox(
+            self.export_window, width=24,
+            values=("背景画像の元サイズ", "1920x1080", "3840x2160", "7680x4320")
+        )
+        size_combo.current(0)
+        size_combo.pack(padx=20, pady=(0, 10))
+
+        button_frame = tk.Frame(self.export_window)
+        button_frame.pack(pady=10)
+        tk.Button(button_frame, text="キャンセル", width=10, command=self._close_export_window).pack(side=tk.LEFT, padx=10)
+        tk.Button(button_frame, text="書き出し", width=10, command=lambda: self._export_image(size_combo.get())).pack(side=tk.RIGHT, padx=10)
+
+    def _close_export_window(self):
+        if self.export_window and self.export_window.winfo_exists():
+            self.export_window.destroy()
+        self.export_window = None
+
+    def _export_image(self, size_text):
+        from tkinter import filedialog, messagebox
+        from concurrent.futures import ThreadPoolExecutor
+        from mojist.export import export_project
+
+        size = None
+        if "x" in size_text.lower():
+            try:
+                w, _, h = size_text.lower().partition("x")
+                size = (int(w), int(h))
+            except ValueError:
+                messagebox.showerror("入力エラー", f"出力サイズは 1920x1080 のように入力してください。\n{size_text}")
+                return
+
+        output_folder = self.BASE_DIR / "Output"
+        output_folder.mkdir(exist_ok=True)
+        file_path = filedialog.asksaveasfilename(
+            initialdir=output_folder,
+            title="画像を書き出し",
+            filetypes=(("PNG画像", "*.png"), ("JPEG画像", "*.jpg"), ("すべてのファイル", "*.*")),
+            defaultextension=".png"
+        )
+        if not file_path:
+            return
+        self._close_export_window()
+
+        if self.export_executor is None:
+            self.export_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        future = self.export_executor.submit(export_project, self._project_data(), file_path, size)
+        self.root.after(100, self._poll_export, future, file_path)
+
+    def _poll_export(self, future, file_path):
+        from tkinter import messagebox
+
+        if not future.done():
+            self.root.after(100, self._poll_export, future, file_path)
+            return
+        try:
+            w, h = future.result()
+            messagebox.showinfo("書き出し完了", f"画像を書き出しました。({w}×{h})\n{Path(file_path).name}")
+        except Exception as e:
+            messagebox.showerror("書き出しエラー", f"画像の書き出しに失敗しました。\n\n詳細: {e}")
+
+    @traced("save_project")
+    def _write_project_file(self, file_path, project_data):
+        from mojist.project import write_project
+
+        write_project(file_path, project_data)
+        if self.project_library is not None:
+            self.project_library.update_file(file_path)
+
     def _load_project(self):
+        from tkinter import filedialog
+
         file_path = filedialog.askopenfilename(
             initialdir=self.PROJECTS_FOLDER,
             title="プロジェクトを呼び出し",
@@ -566,23 +1339,22 @@ class MojistApp:
         if not file_path:
             return
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        self._open_project_file(file_path)
 
-            self.fixed_text = data.get("text", "文字")
-            self.input_text.delete(0, tk.END)
-            self.input_text.insert(0, self.fixed_text)
-            
-            self.selected_font_name = data.get("font_name", self._get_initial_font())
-            self.font_combo.set(self.selected_font_name)
+    @traced("load_project")
+    def _open_project_file(self, file_path, notify=True):
+        from tkinter import messagebox
+        from mojist.project import project_layers, read_project
+
+        try:
+            data = read_project(file_path)
 
-            self.font_size = data.get("font_size", 50)
-            self.text_color = data.get("text_color", "white")
-            self.outline_color = data.get("outline_color", "black")
-            self.outline_width = data.get("outline_width", 2)
-            self.x = data.get("x", 512)
-            self.y = data.get("y", 502)
+            layers = []
+            for settings in project_layers(data):
+                layer = TextLayer.from_settings(settings)
+                layer.font_name = layer.font_name or self._get_initial_font()
+                layers.append(layer)
+            self._replace_layers(layers)
 
             bg_path_str = data.get("background_image_path")
             if bg_path_str:
@@ -591,14 +1363,49 @@ class MojistApp:
                     self.apply_background_image(bg_path)
                 else:
                     messagebox.showwarning("警告", f"背景画像が見つかりませんでした。\n{bg_path_str}")
+            self._commit_history()
             
-            self.update_text()
-            messagebox.showinfo("読み込み完了", f"プロジェクトを読み込みました。\n{Path(file_path).name}")
+            if notify:
+                messagebox.showinfo("読み込み完了", f"プロジェクトを読み込みました。\n{Path(file_path).name}")
 
         except Exception as e:
             messagebox.showerror("読み込みエラー", f"プロジェクトの読み込みに失敗しました。\n\n詳細: {e}")
 
+    def open_project_library(self):
+        if self.library_window and self.library_window.exists():
+            self.library_window.lift()
+            return
+        from mojist.library import ProjectLibrary
+        from mojist.library_window import ProjectLibraryWindow
+
+        if self.project_library is None:
+            self.project_library = ProjectLibrary(self.CACHE_FOLDER / "projects.sqlite3", self.PROJECTS_FOLDER)
+        self.library_window = ProjectLibraryWindow(
+            self.root, self.project_library,
+            on_open=lambda path: self._open_project_file(path, notify=False),
+            on_select=self._preload_project_background
+        )
+
+    def _preload_project_background(self, row):
+        bg_path = row.get("background_image_path")
+        if bg_path and Path(bg_path).exists():
+            self.bg_cache.preload(Path(bg_path))
+
 if __name__ == '__main__':
+    import multiprocessing
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        from mojist.batch import main
+        sys.exit(main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "sequence":
+        from mojist.sequence import main
+        sys.exit(main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "animate":
+        from mojist.animate import main
+        sys.exit(main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        from mojist.autorender import main
+        sys.exit(main(sys.argv[2:]))
     root = tk.Tk()
     app = MojistApp(root)
     root.mainloop()
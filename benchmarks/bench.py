@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+
+from mojist.backgrounds import decode_preview
+from mojist.folder_index import FolderIndex
+from mojist.fonts import load_font
+from mojist.headless import render_project
+from mojist.project import DEFAULT_PIXELS_PER_POINT
+from mojist.render import render_text_sprite
+from mojist.thumbs import ThumbnailStore, decode_thumbnail
+
+BENCH_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCH_DIR / "baseline.json"
+FIXTURE_VERSION = 1
+SAMPLE_TEXT = "Mojist テロップ 123"
+BENCH_FONT = "DejaVu Sans"
+
+OUTLINE_WIDTHS = (0, 1, 2, 5, 10)
+EFFECT_WIDTHS = (10, 20, 40)
+FONT_SIZES = (10, 50, 100, 200)
+GALLERY_PAGE = 12
+INDEX_FILES = 2000
+
+
+def synthetic_image(size, seed):
+    rng = random.Random(seed)
+    w, h = size
+    gradient = Image.linear_gradient("L").resize(size)
+    radial = Image.radial_gradient("L").resize(size)
+    img = Image.merge("RGB", (gradient, radial, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    draw = ImageDraw.Draw(img)
+    for _ in range(400):
+        x0, y0 = rng.randrange(w), rng.randrange(h)
+        x1, y1 = x0 + rng.randrange(-w // 4, w // 4), y0 + rng.randrange(-h // 4, h // 4)
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        draw.line((x0, y0, x1, y1), fill=color, width=rng.randrange(1, 12))
+    return img
+
+
+def build_fixtures(root):
+    root = Path(root)
+    stamp = root / "fixtures.json"
+    try:
+        if json.loads(stamp.read_text(encoding="utf-8")).get("version") == FIXTURE_VERSION:
+            return root
+    except (OSError, ValueError):
+        pass
+    if root.exists():
+        shutil.rmtree(root)
+    (root / "index").mkdir(parents=True)
+
+    synthetic_image((6000, 4000), 1).save(root / "large.jpg", quality=90)
+    synthetic_image((4000, 2250), 2).save(root / "large.png")
+    synthetic_image((1920, 1080), 3).save(root / "hd.jpg", quality=90)
+    for i in range(GALLERY_PAGE):
+        shutil.copyfile(root / "large.jpg", root / f"page_{i:02d}.jpg")
+    for i in range(INDEX_FILES):
+        sub = root / "index" / f"dir{i % 20:02d}"
+        sub.mkdir(exist_ok=True)
+        (sub / f"image_{i:05d}.jpg").write_bytes(b"")
+
+    stamp.write_text(json.dumps({"version": FIXTURE_VERSION}), encoding="utf-8")
+    return root
+
+
+def bench_font(pixel_size):
+    font = load_font(BENCH_FONT, pixel_size)
+    return font if font is not None else ImageFont.load_default(pixel_size)
+
+
+def measure(fn, repeat, setup=None):
+    samples = []
+    for i in range(repeat + 1):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg) if setup else fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        if i:
+            samples.append(elapsed)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "repeat": repeat,
+    }
+
+
+def text_cases(fixtures, scale):
+    for size in FONT_SIZES:
+        font = bench_font(max(1, round(size * DEFAULT_PIXELS_PER_POINT)))
+        for width in OUTLINE_WIDTHS:
+            yield f"text.render[size={size},outline={width}]", lambda f=font, w=width: render_text_sprite(
+                SAMPLE_TEXT, f, "white", "black", w
+            ), 20 * scale, None
+
+    rendered = render_text_sprite(SAMPLE_TEXT, bench_font(133), "white", "black", 5)
+    yield "text.recolor[size=100,outline=5]", lambda: rendered.sprite.compose("yellow", "navy"), 20 * scale, None
+
+    font = bench_font(133)
+    for width in EFFECT_WIDTHS:
+        effects = (
+            {"type": "stroke", "width": width, "color": "black"},
+            {"type": "shadow", "dx": 8, "dy": 8, "blur": width / 2, "color": "black", "opacity": 0.6},
+        )
+        yield f"text.effects[size=100,stroke={width}+shadow]", lambda e=effects: render_text_sprite(
+            SAMPLE_TEXT, font, "white", "white", 5, e
+        ), 10 * scale, None
+
+
+def background_cases(fixtures, scale):
+    for name in ("large.jpg", "large.png", "hd.jpg"):
+        path = fixtures / name
+        yield f"background.decode_preview[{name}]", lambda p=path: decode_preview(p), 3 * scale, None
+
+
+def gallery_cases(fixtures, scale):
+    page = [fixtures / f"page_{i:02d}.jpg" for i in range(GALLERY_PAGE)]
+
+    def cold_store():
+        return ThumbnailStore(Path(tempfile.mkdtemp(prefix="thumbs-", dir=fixtures / "work")), (160, 90))
+
+    def load_page(store):
+        try:
+            for path in page:
+                store.get(path)
+        finally:
+            shutil.rmtree(store.cache_dir, ignore_errors=True)
+
+    yield f"gallery.page_cold[{GALLERY_PAGE}x6000x4000]", load_page, 2 * scale, cold_store
+
+    warm = ThumbnailStore(fixtures / "work" / "warm_thumbs", (160, 90))
+    for path in page:
+        warm.get(path)
+    yield f"gallery.page_warm[{GALLERY_PAGE}]", lambda: [warm.get(p) for p in page], 10 * scale, None
+    yield "gallery.decode_thumbnail[6000x4000]", lambda: decode_thumbnail(page[0], (160, 90)), 5 * scale, None
+
+    index = FolderIndex(fixtures / "index", fixtures / "work" / "index.json")
+    index.refresh()
+    yield f"gallery.index_refresh[{INDEX_FILES}]", lambda: index.refresh(), 10 * scale, None
+
+
+def headless_cases(fixtures, scale):
+    data = {
+        "background_image_path": str(fixtures / "hd.jpg"),
+        "font_name": BENCH_FONT,
+        "layers": [
+            {"text": SAMPLE_TEXT, "font_size": 80, "y": 120},
+            {"text": SAMPLE_TEXT, "font_size": 40, "y": 300, "outline_width": 4},
+            {"text": SAMPLE_TEXT, "font_size": 30, "y": 502},
+        ],
+    }
+    render_project(data)
+    yield "headless.render_project[1920x1080,3 layers]", lambda: render_project(data), 5 * scale, None
+
+
+def tk_cases(fixtures, scale):
+    try:
+        import tkinter as tk
+        from PIL import ImageTk
+
+        root = tk.Tk()
+    except Exception as e:
+        print(f"Tkのベンチマークを省略します (ディスプレイがありません): {e}", file=sys.stderr)
+        return
+    root.withdraw()
+    canvas = tk.Canvas(root, width=1024, height=576)
+    canvas.pack()
+
+    def legacy_text(size, width):
+        font_tuple = (BENCH_FONT, size, "bold")
+        for dx in range(-width, width + 1):
+            for dy in range(-width, width + 1):
+                if width and dx**2 + dy**2 <= width**2:
+                    canvas.create_text(512 + dx, 502 + dy, text=SAMPLE_TEXT, font=font_tuple, fill="black", tags="bench")
+        canvas.create_text(512, 502, text=SAMPLE_TEXT, font=font_tuple, fill="white", tags="bench")
+        canvas.update_idletasks()
+        canvas.delete("bench")
+
+    for size in FONT_SIZES:
+        for width in OUTLINE_WIDTHS:
+            yield f"tk.legacy_text[size={size},outline={width}]", lambda s=size, w=width: legacy_text(s, w), 5 * scale, None
+
+    rendered = render_text_sprite(SAMPLE_TEXT, bench_font(133), "white", "black", 5)
+    yield "tk.photo_image[text size=100]", lambda: ImageTk.PhotoImage(rendered.image), 20 * scale, None
+    preview = decode_preview(fixtures / "large.jpg")
+    yield "tk.photo_image[background 1024x576]", lambda: ImageTk.PhotoImage(preview), 10 * scale, None
+
+
+GROUPS = {
+    "text": text_cases,
+    "background": background_cases,
+    "gallery": gallery_cases,
+    "headless": headless_cases,
+    "tk": tk_cases,
+}
+
+
+def run(fixtures, groups, scale=1):
+    shutil.rmtree(fixtures / "work", ignore_errors=True)
+    (fixtures / "work").mkdir()
+    results = {}
+    for group in groups:
+        for name, fn, repeat, setup in GROUPS[group](fixtures, scale):
+            results[name] = measure(fn, max(1, repeat), setup)
+            print(f"{name:<48} {results[name]['median_ms']:>10.2f} ms")
+    return results
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "font": BENCH_FONT if load_font(BENCH_FONT, 20) is not None else "default",
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        fastest, base_fastest = result["min_ms"], base["min_ms"]
+        if fastest > base_fastest * (1 + tolerance) and fastest - base_fastest > min_delta_ms:
+            regressions.append((name, base_fastest, fastest))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mojist-bench", description="描画・ギャラリーの性能を計測し、基準値と比較します。")
+    parser.add_argument("groups", nargs="*", help=f"計測するグループ: {', '.join(GROUPS)} (既定: すべて)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="比較する基準値ファイル")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果を基準値として保存する")
+    parser.add_argument("-o", "--output", help="結果をJSONで保存するファイル")
+    parser.add_argument("--fixtures", default=str(Path(tempfile.gettempdir()) / "mojist-bench-fixtures"), help="合成画像の作成先")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="許容する遅延の割合 (最速値で比較、既定: 0.5 = 50%%)")
+    parser.add_argument("--min-delta", type=float, default=2.0, help="これ未満の差(ms)は無視する")
+    parser.add_argument("--repeat-scale", type=int, default=1, help="繰り返し回数の倍率")
+    args = parser.parse_args(argv)
+
+    unknown = [g for g in args.groups if g not in GROUPS]
+    if unknown:
+        parser.error(f"不明なグループ: {', '.join(unknown)}")
+    groups = args.groups or list(GROUPS)
+    fixtures = build_fixtures(args.fixtures)
+    results = run(fixtures, groups, args.repeat_scale)
+    report = {"environment": environment(), "results": results}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline = {}
+        if baseline_path.exists():
+            with open(baseline_path, "r", encoding="utf-8") as f:
+                baseline = json.load(f).get("results", {})
+        baseline.update(results)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"environment": report["environment"], "results": baseline}, f, ensure_ascii=False, indent=2)
+        print(f"基準値を保存しました: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"基準値がないため比較を省略します: {baseline_path}")
+        return 0
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+        print("注意: 基準値は別の環境で計測されています。", file=sys.stderr)
+    regressions = compare(results, baseline.get("results", {}), args.tolerance, args.min_delta)
+    if regressions:
+        print(f"\n性能低下を検出しました ({len(regressions)} 件):", file=sys.stderr)
+        for name, before, after in regressions:
+            print(f"  {name}: {before:.2f} ms -> {after:.2f} ms ({after / before:.2f}x)", file=sys.stderr)
+        return 1
+    print("\n基準値からの性能低下はありません。")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
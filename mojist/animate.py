@@ -0,0 +1,292 @@
+import argparse
+import io
+import os
+import struct
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from PIL import Image, ImageChops
+
+from mojist.export import open_source
+from mojist.fonts import ensure_font_index
+from mojist.headless import place_text
+from mojist.project import project_layers, read_project
+from mojist.render import paste_sprite
+
+MOTIONS = ("slide_in", "scroll", "fade")
+FORMATS = ("gif", "png", "apng", "webp")
+ALPHA_LEVELS = 64
+
+
+def merge_sprites(sprites):
+    left = min(l for _, l, _ in sprites)
+    top = min(t for _, _, t in sprites)
+    right = max(l + image.width for image, l, _ in sprites)
+    bottom = max(t + image.height for image, _, t in sprites)
+    if len(sprites) == 1:
+        return sprites[0]
+    plate = Image.new("RGBA", (right - left, bottom - top))
+    for image, l, t in sprites:
+        plate.alpha_composite(image, (l - left, t - top))
+    return plate, left, top
+
+
+def _ease_out(t):
+    return 1 - (1 - t) ** 3
+
+
+def motion_at(motion, t, plate_box, frame_size):
+    left, top, right, _ = plate_box
+    if motion == "slide_in":
+        travel = right
+        return -round(travel * (1 - _ease_out(min(t / 0.4, 1.0)))), 0, 1.0
+    if motion == "scroll":
+        start = frame_size[0] - left
+        end = -right
+        return round(start + (end - start) * t), 0, 1.0
+    if motion == "fade":
+        return 0, 0, max(0.0, min(1.0, t / 0.3, (1 - t) / 0.3))
+    raise ValueError(f"不明な動き: {motion}")
+
+
+class FadedSprite:
+    def __init__(self, sprite):
+        self.sprite = sprite
+        self.alpha = sprite.getchannel("A")
+        self.levels = {}
+
+    def at(self, alpha):
+        level = round(alpha * ALPHA_LEVELS)
+        if level >= ALPHA_LEVELS:
+            return self.sprite
+        image = self.levels.get(level)
+        if image is None:
+            scale = level / ALPHA_LEVELS
+            image = self.sprite.copy()
+            image.putalpha(self.alpha.point(lambda a: round(a * scale)))
+            self.levels[level] = image
+        return image
+
+
+class FramePainter:
+    def __init__(self, background):
+        self.background = background
+        self.frame = background.copy()
+        self.previous = None
+
+    def paint(self, sprite, left, top):
+        if self.previous is not None:
+            self.frame.paste(self.background.crop(self.previous), self.previous[:2])
+        box = paste_sprite(self.frame, sprite, left, top) if sprite is not None else None
+        dirty = _union(self.previous, box)
+        self.previous = box
+        return self.frame, dirty
+
+
+def _union(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _chunks(data, start):
+    pos = start
+    while pos < len(data):
+        (length,) = struct.unpack(">I", data[pos:pos + 4])
+        yield data[pos + 4:pos + 8], data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+
+
+def _png_chunk(kind, payload):
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF)
+
+
+class ApngWriter:
+    def __init__(self, fp, size, frame_count, duration_ms, compress_level=6):
+        self.fp = fp
+        self.size = size
+        self.frame_count = frame_count
+        self.duration_ms = duration_ms
+        self.compress_level = compress_level
+        self.sequence = 0
+        self.started = False
+
+    def write(self, frame, box):
+        region = frame.crop(box).convert("RGB")
+        buffer = io.BytesIO()
+        region.save(buffer, "PNG", compress_level=self.compress_level)
+        data = buffer.getvalue()
+        idat = b"".join(payload for kind, payload in _chunks(data, 8) if kind == b"IDAT")
+        if not self.started:
+            ihdr = next(payload for kind, payload in _chunks(data, 8) if kind == b"IHDR")
+            self.fp.write(b"\x89PNG\r\n\x1a\n")
+            self.fp.write(_png_chunk(b"IHDR", ihdr))
+            self.fp.write(_png_chunk(b"acTL", struct.pack(">II", self.frame_count, 0)))
+        self.fp.write(_png_chunk(b"fcTL", struct.pack(
+            ">IIIIIHHBB", self.sequence, region.width, region.height, box[0], box[1],
+            self.duration_ms, 1000, 0, 0
+        )))
+        self.sequence += 1
+        if not self.started:
+            self.fp.write(_png_chunk(b"IDAT", idat))
+            self.started = True
+        else:
+            self.fp.write(_png_chunk(b"fdAT", struct.pack(">I", self.sequence) + idat))
+            self.sequence += 1
+
+    def close(self):
+        self.fp.write(_png_chunk(b"IEND", b""))
+
+
+class GifWriter:
+    def __init__(self, fp, size, palette_image, duration_ms, loop=0):
+        self.fp = fp
+        self.size = size
+        self.palette_image = palette_image
+        self.delay = max(2, round(duration_ms / 10))
+        palette = palette_image.getpalette()[:768]
+        palette += [0] * (768 - len(palette))
+        self.fp.write(b"GIF89a" + struct.pack("<HHBBB", size[0], size[1], 0xF7, 0, 0) + bytes(palette))
+        self.fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\x00")
+
+    def write(self, frame, box):
+        region = frame.crop(box).convert("RGB").quantize(palette=self.palette_image, dither=Image.Dither.FLOYDSTEINBERG)
+        buffer = io.BytesIO()
+        region.save(buffer, "GIF", optimize=False, interlace=False)
+        data = buffer.getvalue()
+        flags = data[10]
+        pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+        table, table_bits = data[13:pos], flags & 7
+        while data[pos:pos + 1] == b"!":
+            pos += 2
+            while data[pos]:
+                pos += data[pos] + 1
+            pos += 1
+        local_flags = data[pos + 9]
+        start = pos + 10
+        if local_flags & 0x80:
+            start += 3 << ((local_flags & 7) + 1)
+            table, table_bits = data[pos + 10:start], local_flags & 7
+        self.fp.write(b"!\xf9\x04" + struct.pack("<BHBB", 1 << 2, self.delay, 0, 0))
+        self.fp.write(b"," + struct.pack("<HHHHB", box[0], box[1], region.width, region.height, 0x80 | table_bits))
+        self.fp.write(table)
+        self.fp.write(data[start:-1])
+
+    def close(self):
+        self.fp.write(b";")
+
+
+class WebpWriter:
+    def __init__(self, fp, size, duration_ms, quality=80, lossless=False, loop=0):
+        from PIL import features
+
+        if not features.check("webp"):
+            raise OSError("このPillowはWebPに対応していません")
+        self.fp = fp
+        self.duration_ms = duration_ms
+        self.options = {"quality": quality, "lossless": lossless, "loop": loop}
+        self.frames = []
+        self.durations = []
+
+    def write(self, frame, box):
+        if self.frames:
+            region = frame.crop(box).convert("RGB")
+            if ImageChops.difference(region, self.frames[-1].crop(box)).getbbox() is None:
+                self.durations[-1] += self.duration_ms
+                return
+        self.frames.append(frame.convert("RGB"))
+        self.durations.append(self.duration_ms)
+
+    def close(self):
+        first, rest = self.frames[0], self.frames[1:]
+        first.save(self.fp, "WEBP", save_all=True, append_images=rest, duration=self.durations, **self.options)
+
+
+def gif_palette(background, plate, left, top):
+    sample_bg = background.convert("RGB")
+    sample_bg.thumbnail((480, 480))
+    parts = [sample_bg]
+    for alpha in (1.0, 0.5):
+        frame = background.copy()
+        box = paste_sprite(frame, FadedSprite(plate).at(alpha), left, top)
+        if box is not None:
+            parts.append(frame.crop(box).convert("RGB"))
+    sample = Image.new("RGB", (max(p.width for p in parts), sum(p.height for p in parts)))
+    y = 0
+    for part in parts:
+        sample.paste(part, (0, y))
+        y += part.height
+    return sample.quantize(256)
+
+
+def output_format(path, fmt=None):
+    fmt = (fmt or Path(path).suffix.lstrip(".")).lower()
+    return "apng" if fmt == "png" else fmt
+
+
+def export_animation(data, output_path, motion="slide_in", seconds=3.0, fps=20, size=None, fmt=None):
+    fmt = output_format(output_path, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"対応していない形式です: {fmt}")
+    layers = project_layers(data)
+    bg_path = layers[0]["background_image_path"]
+    if bg_path and os.path.exists(bg_path):
+        background = open_source(bg_path, size)
+    else:
+        background = Image.new("RGB", tuple(size or layers[0]["canvas_size"]), (128, 128, 128))
+    background = background.convert("RGBA")
+
+    plate, left, top = merge_sprites([place_text(settings, background.size) for settings in layers])
+    plate_box = (left, top, left + plate.width, top + plate.height)
+    faded = FadedSprite(plate)
+    frame_count = max(1, round(seconds * fps))
+    duration_ms = round(1000 / fps)
+    full = (0, 0) + background.size
+
+    painter = FramePainter(background)
+    with open(output_path, "wb") as fp:
+        if fmt == "gif":
+            writer = GifWriter(fp, background.size, gif_palette(background, plate, left, top), duration_ms)
+        elif fmt == "apng":
+            writer = ApngWriter(fp, background.size, frame_count, duration_ms)
+        else:
+            writer = WebpWriter(fp, background.size, duration_ms)
+        for i in range(frame_count):
+            t = i / (frame_count - 1) if frame_count > 1 else 1.0
+            dx, dy, alpha = motion_at(motion, t, plate_box, background.size)
+            sprite = faded.at(alpha) if alpha > 0 else None
+            frame, dirty = painter.paint(sprite, left + dx, top + dy)
+            writer.write(frame, full if i == 0 else dirty or (0, 0, 1, 1))
+        writer.close()
+    return frame_count
+
+
+def _parse_size(value):
+    w, _, h = value.lower().partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mojist-animate", description="プロジェクトの文字を動かしたアニメーション画像(GIF/APNG/WebP)を出力します。")
+    parser.add_argument("project", help="スタイルと背景に使うプロジェクト(.json)")
+    parser.add_argument("output", help="出力ファイル (.gif / .png / .webp)")
+    parser.add_argument("-m", "--motion", choices=MOTIONS, default="slide_in", help="動き (既定: slide_in)")
+    parser.add_argument("-s", "--seconds", type=float, default=3.0, help="長さ(秒) (既定: 3)")
+    parser.add_argument("--fps", type=int, default=20, help="1秒あたりのコマ数 (既定: 20)")
+    parser.add_argument("--size", type=_parse_size, default=None, help="出力サイズ 例: 1280x720 (既定: 背景画像の元サイズ)")
+    args = parser.parse_args(argv)
+
+    ensure_font_index()
+    start = time.perf_counter()
+    count = export_animation(read_project(args.project), args.output, args.motion, args.seconds, args.fps, args.size)
+    elapsed = time.perf_counter() - start
+    print(f"{count} コマのアニメーションを出力しました ({elapsed:.1f}秒): {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
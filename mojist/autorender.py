@@ -0,0 +1,310 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from mojist.fonts import ensure_font_index
+from mojist.headless import BACKGROUND_CACHE_BYTES, limit_background_cache, render_project, save_image
+from mojist.project import find_projects, project_layers, read_project
+from mojist.watch import create_watcher
+
+MANIFEST_NAME = ".render_manifest.json"
+MANIFEST_VERSION = 1
+RENDER_VERSION = 1
+
+
+def file_stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def background_path(data):
+    path = project_layers(data)[0]["background_image_path"]
+    return str(Path(path).resolve()) if path else ""
+
+
+def input_key(data, fmt, size=None):
+    layers = project_layers(data)
+    bg = background_path(data)
+    payload = {
+        "version": RENDER_VERSION,
+        "layers": layers,
+        "background": [bg, file_stat(bg)] if bg else None,
+        "format": fmt,
+        "size": list(size) if size else None,
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _render_job(data, output_path, size):
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f".{output_path.stem}.tmp{output_path.suffix}")
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        save_image(render_project(data, size), str(tmp_path))
+        os.replace(tmp_path, output_path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return traceback.format_exc()
+    return None
+
+
+class RenderManifest:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = dict(data.get("entries", {}))
+
+    def get(self, project):
+        return self.entries.get(project)
+
+    def put(self, project, entry):
+        self.entries[project] = entry
+        self._dirty = True
+
+    def remove(self, project):
+        if self.entries.pop(project, None) is not None:
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"出力記録の保存失敗: {e}", file=sys.stderr)
+
+
+class RenderService:
+    def __init__(self, projects_dir, output_dir, image_dir=None, fmt="png", workers=2, size=None,
+                 manifest_path=None, debounce=0.5, prefer_native=True):
+        self.projects_dir = Path(projects_dir).resolve()
+        self.output_dir = Path(output_dir).resolve()
+        self.image_dir = Path(image_dir).resolve() if image_dir else None
+        self.fmt = fmt
+        self.workers = max(1, workers)
+        self.size = size
+        self.debounce = debounce
+        self.prefer_native = prefer_native
+        self.manifest = RenderManifest(manifest_path or self.output_dir / MANIFEST_NAME)
+
+        self.pending = {}
+        self.running = {}
+        self.by_background = {}
+        for project, entry in self.manifest.entries.items():
+            self._link_background(project, entry.get("background", ""))
+        self.executor = None
+        self.watcher = None
+        self.stats = {"rendered": 0, "skipped": 0, "failed": 0}
+
+    def start(self):
+        ensure_font_index()
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=limit_background_cache,
+            initargs=(BACKGROUND_CACHE_BYTES // self.workers,)
+        )
+        roots = [self.projects_dir] + ([self.image_dir] if self.image_dir else [])
+        self.watcher = create_watcher(roots, self.prefer_native)
+        self.rescan()
+
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self._collect()
+        self.manifest.save()
+
+    def output_path(self, project):
+        rel = Path(project).relative_to(self.projects_dir)
+        return self.output_dir / rel.with_suffix(f".{self.fmt}")
+
+    def _link_background(self, project, bg):
+        for projects in self.by_background.values():
+            projects.discard(project)
+        if bg:
+            self.by_background.setdefault(bg, set()).add(project)
+
+    def schedule(self, project, now=None):
+        self.pending[str(project)] = (now or time.monotonic()) + self.debounce
+
+    def rescan(self, now=None):
+        now = now or time.monotonic()
+        projects = {str(p.resolve()) for p in find_projects(self.projects_dir)} if self.projects_dir.is_dir() else set()
+        for project in list(self.manifest.entries):
+            if project not in projects:
+                self.manifest.remove(project)
+                self._link_background(project, "")
+        for project in projects:
+            if project not in self.pending:
+                self.pending[project] = now
+
+    def handle_changes(self, changed, now=None):
+        now = now or time.monotonic()
+        if changed is None:
+            self.rescan(now)
+            return
+        for path in changed:
+            path = Path(path)
+            if path.is_dir():
+                self.rescan(now)
+                return
+            if path.suffix.lower() == ".json" and self.projects_dir in path.parents:
+                self.schedule(path, now)
+            for project in self.by_background.get(str(path), ()):
+                self.schedule(project, now)
+
+    def _unchanged(self, entry, stat):
+        if entry is None or entry.get("stat") != stat:
+            return False
+        bg = entry.get("background", "")
+        if bg and file_stat(bg) != entry.get("background_stat"):
+            return False
+        return entry.get("failed") or os.path.exists(entry["output"])
+
+    def _dispatch(self, now):
+        busy = {job[0] for job in self.running.values()}
+        due = sorted((t, p) for p, t in self.pending.items() if t <= now and p not in busy)
+        for _, project in due:
+            if len(self.running) >= self.workers:
+                break
+            del self.pending[project]
+            stat = file_stat(project)
+            if stat is None:
+                self.manifest.remove(project)
+                self._link_background(project, "")
+                continue
+            entry = self.manifest.get(project)
+            if self._unchanged(entry, stat):
+                continue
+            try:
+                data = read_project(project)
+                key = input_key(data, self.fmt, self.size)
+                bg = background_path(data)
+            except Exception as e:
+                print(f"プロジェクトを読み込めません: {project}: {e}", file=sys.stderr)
+                self.manifest.put(project, {"key": None, "output": "", "stat": stat, "failed": True})
+                self.stats["failed"] += 1
+                continue
+            self._link_background(project, bg)
+            output = str(self.output_path(project))
+            record = {
+                "key": key, "output": output, "stat": stat,
+                "background": bg, "background_stat": file_stat(bg) if bg else None,
+            }
+            if entry is not None and entry.get("key") == key and (entry.get("failed") or os.path.exists(output)):
+                if entry.get("failed"):
+                    record["failed"] = True
+                self.manifest.put(project, record)
+                self.stats["skipped"] += 1
+                continue
+            future = self.executor.submit(_render_job, data, output, self.size)
+            self.running[future] = (project, record, time.perf_counter())
+
+    def _collect(self):
+        for future in [f for f in self.running if f.done()]:
+            project, record, started = self.running.pop(future)
+            try:
+                error = future.result()
+            except Exception:
+                error = traceback.format_exc()
+            name = Path(project).relative_to(self.projects_dir)
+            if error:
+                record["failed"] = True
+                self.stats["failed"] += 1
+                print(f"失敗: {name}\n{error}", file=sys.stderr)
+            else:
+                self.stats["rendered"] += 1
+                print(f"出力: {name} ({time.perf_counter() - started:.1f}秒)")
+            self.manifest.put(project, record)
+
+    def step(self):
+        now = time.monotonic()
+        self.handle_changes(self.watcher.poll(), now)
+        self._collect()
+        self._dispatch(now)
+        self.manifest.save()
+
+    def idle(self):
+        return not self.pending and not self.running
+
+    def run(self, interval=None, once=False):
+        interval = interval or (0.2 if self.watcher.backend == "inotify" else 2.0)
+        while True:
+            self.step()
+            if once and self.idle():
+                return
+            time.sleep(min(interval, self.debounce) if self.pending or self.running else interval)
+
+
+def _parse_size(value):
+    w, _, h = value.lower().partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="mojist-watch",
+        description="プロジェクトと背景画像のフォルダを監視し、変更があったプロジェクトだけを自動で画像出力します。"
+    )
+    parser.add_argument("projects", nargs="?", default="Projects", help="プロジェクト(.json)のフォルダ (既定: Projects)")
+    parser.add_argument("-i", "--images", help="背景画像のフォルダ (既定: プロジェクトフォルダと同じ階層の Image)")
+    parser.add_argument("-o", "--output", help="出力先フォルダ (既定: プロジェクトフォルダと同じ階層の Output)")
+    parser.add_argument("-f", "--format", choices=("png", "jpg"), default="png")
+    parser.add_argument("-j", "--jobs", type=int, default=2, help="並列プロセス数 (既定: 2)")
+    parser.add_argument("--size", type=_parse_size, default=None, help="出力サイズ 例: 3840x2160 (既定: 背景画像の元サイズ)")
+    parser.add_argument("--debounce", type=float, default=0.5, help="連続した保存をまとめる待ち時間(秒) (既定: 0.5)")
+    parser.add_argument("--interval", type=float, default=None, help="変更を確認する間隔(秒) (既定: inotify 0.2 / ポーリング 2)")
+    parser.add_argument("--polling", action="store_true", help="inotify を使わずポーリングで監視する")
+    parser.add_argument("--once", action="store_true", help="変更のあった分だけ出力して終了する")
+    args = parser.parse_args(argv)
+
+    parent = Path(args.projects).resolve().parent
+    service = RenderService(
+        args.projects, args.output or parent / "Output", args.images or parent / "Image",
+        args.format, args.jobs, args.size, debounce=args.debounce, prefer_native=not args.polling
+    )
+    service.start()
+    if not args.once:
+        print(f"監視を開始しました ({service.watcher.backend}): {service.projects_dir} -> {service.output_dir}  (Ctrl+Cで終了)")
+    try:
+        service.run(args.interval, once=args.once)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    stats = service.stats
+    print(f"出力 {stats['rendered']} 件 / 内容が同じため省略 {stats['skipped']} 件 / 失敗 {stats['failed']} 件")
+    return 1 if args.once and stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
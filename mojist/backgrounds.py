@@ -0,0 +1,129 @@
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk
+
+from mojist.cache import LRUCache
+
+PREVIEW_SIZE = (1024, 576)
+
+
+def decode_preview(path, size=PREVIEW_SIZE):
+    with Image.open(path) as img:
+        img.draft("RGB", size)
+        img.load()
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA" if "transparency" in img.info or "A" in img.getbands() else "RGB")
+        factor = min(img.width // size[0], img.height // size[1])
+        if factor >= 2:
+            img = img.reduce(factor)
+        return img.resize(size)
+
+
+class DecodedBackground:
+    def __init__(self, path, image):
+        self.path = path
+        self.image = image
+        self.photo = None
+        self.evicted = True
+
+    @property
+    def nbytes(self):
+        w, h = self.image.size
+        return w * h * len(self.image.getbands()) + w * h * 4
+
+
+class BackgroundCache:
+    def __init__(self, widget, max_bytes=192 * 1024 * 1024, size=PREVIEW_SIZE, proxy_store=None, on_evict=None):
+        self.widget = widget
+        self.size = size
+        self.proxy_store = proxy_store
+        self.memory = LRUCache(max_bytes, lambda decoded: decoded.nbytes, on_evict)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+        self.pending = {}
+        self.callbacks = {}
+        self.poll_job = None
+
+    def _key(self, path):
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, path):
+        key = self._key(path)
+        decoded = self.memory.get(key)
+        if decoded is None:
+            future = self.pending.pop(key, None)
+            if future is not None:
+                image = future.result()
+            else:
+                image = self._decode(path)
+                if self.proxy_store is not None:
+                    self.proxy_store.save_index()
+            decoded = self._store(key, path, image)
+            for callback in self.callbacks.pop(key, []):
+                callback(decoded, None)
+        return decoded
+
+    def preload(self, path):
+        self.request(path, None)
+
+    def request(self, path, callback):
+        try:
+            key = self._key(path)
+        except OSError as e:
+            if callback:
+                callback(None, e)
+            return
+        decoded = self.memory.get(key)
+        if decoded is not None:
+            if callback:
+                callback(decoded, None)
+            return
+        if callback:
+            self.callbacks.setdefault(key, []).append(callback)
+        if key not in self.pending:
+            self.pending[key] = self.executor.submit(self._decode, path)
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(20, self._poll)
+
+    def close(self):
+        if self.poll_job is not None:
+            self.widget.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.pending.clear()
+        self.callbacks.clear()
+        if self.proxy_store is not None:
+            self.proxy_store.save_index()
+
+    def _decode(self, path):
+        if self.proxy_store is not None:
+            return self.proxy_store.get(path)
+        return decode_preview(path, self.size)
+
+    def _store(self, key, path, image):
+        decoded = DecodedBackground(path, image)
+        decoded.photo = ImageTk.PhotoImage(image)
+        self.memory.put(key, decoded)
+        decoded.evicted = key not in self.memory
+        return decoded
+
+    def _poll(self):
+        self.poll_job = None
+        for key, future in list(self.pending.items()):
+            if not future.done():
+                continue
+            del self.pending[key]
+            decoded, error = None, None
+            try:
+                decoded = self._store(key, key[0], future.result())
+            except Exception as e:
+                error = e
+                print(f"背景画像の先読み失敗: {key[0]}\n{traceback.format_exc()}")
+            for callback in self.callbacks.pop(key, []):
+                callback(decoded, error)
+        if self.pending:
+            self.poll_job = self.widget.after(20, self._poll)
+        elif self.proxy_store is not None:
+            self.proxy_store.save_index()
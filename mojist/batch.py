@@ -0,0 +1,109 @@
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from mojist.fonts import ensure_font_index
+from mojist.headless import BACKGROUND_CACHE_BYTES, limit_background_cache, render_project, save_image
+from mojist.project import find_projects, read_project
+
+CHUNK_SIZE = 16
+
+
+def render_file(data, output_path, size=None):
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    save_image(render_project(data, size), output_path)
+
+
+def _render_chunk(jobs, size):
+    results = []
+    for project_path, output_path, data, error in jobs:
+        if error is None:
+            try:
+                render_file(data, output_path, size)
+            except Exception:
+                error = traceback.format_exc()
+        results.append((project_path, error))
+    return results
+
+
+def plan_jobs(project_paths, projects_dir, output_dir, fmt):
+    groups = {}
+    for project_path in project_paths:
+        data, error, bg = None, None, ""
+        try:
+            data = read_project(project_path)
+            bg = data.get("background_image_path") or ""
+        except Exception:
+            error = traceback.format_exc()
+        rel = Path(project_path).relative_to(projects_dir)
+        output_path = Path(output_dir) / rel.with_suffix(f".{fmt}")
+        groups.setdefault(bg, []).append((str(project_path), str(output_path), data, error))
+
+    chunks = []
+    for jobs in groups.values():
+        for i in range(0, len(jobs), CHUNK_SIZE):
+            chunks.append(jobs[i:i + CHUNK_SIZE])
+    return chunks
+
+
+def _report(results, total, failures):
+    done = 0
+    for chunk_results in results:
+        for project_path, error in chunk_results:
+            done += 1
+            if error:
+                failures.append(project_path)
+                print(f"[{done}/{total}] 失敗: {project_path}\n{error}", file=sys.stderr)
+            else:
+                print(f"[{done}/{total}] {Path(project_path).name}")
+
+
+def render_directory(projects_dir, output_dir, fmt="png", workers=None, size=None):
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    ensure_font_index()
+    chunks = plan_jobs(find_projects(projects_dir), projects_dir, output_dir, fmt)
+    total = sum(len(c) for c in chunks)
+    failures = []
+
+    if workers == 1:
+        _report((_render_chunk(chunk, size) for chunk in chunks), total, failures)
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=limit_background_cache,
+            initargs=(BACKGROUND_CACHE_BYTES // workers,)
+        ) as executor:
+            futures = [executor.submit(_render_chunk, chunk, size) for chunk in chunks]
+            _report((future.result() for future in as_completed(futures)), total, failures)
+    return total, failures
+
+
+def _parse_size(value):
+    w, _, h = value.lower().partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mojist-batch", description="プロジェクトファイルを画像として一括出力します。")
+    parser.add_argument("projects", help="プロジェクト(.json)のフォルダ")
+    parser.add_argument("-o", "--output", help="出力先フォルダ (既定: プロジェクトフォルダと同じ階層の Output)")
+    parser.add_argument("-f", "--format", choices=("png", "jpg"), default="png")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="並列プロセス数 (既定: CPU数)")
+    parser.add_argument("--size", type=_parse_size, default=None, help="出力サイズ 例: 3840x2160 (既定: 背景画像の元サイズ)")
+    args = parser.parse_args(argv)
+
+    output = args.output or str(Path(args.projects).resolve().parent / "Output")
+    start = time.perf_counter()
+    total, failures = render_directory(args.projects, output, args.format, args.jobs, args.size)
+    elapsed = time.perf_counter() - start
+    print(f"{total - len(failures)}/{total} 件を出力しました ({elapsed:.1f}秒): {output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
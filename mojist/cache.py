@@ -0,0 +1,78 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    def __init__(self, max_bytes, sizeof, on_evict=None):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.on_evict = on_evict
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.budget = None
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = self.sizeof(value)
+        with self._lock:
+            self._discard(key)
+            if nbytes > self.max_bytes:
+                return value
+            self._items[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._shrink(self.max_bytes)
+        if self.budget is not None:
+            self.budget.enforce()
+        return value
+
+    def evict_oldest(self):
+        with self._lock:
+            if len(self._items) <= 1:
+                return 0
+            before = self.current_bytes
+            self._shrink(before - 1)
+            return before - self.current_bytes
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._items),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _discard(self, key):
+        entry = self._items.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def _shrink(self, limit):
+        while self._items and self.current_bytes > limit:
+            key, (value, nbytes) = self._items.popitem(last=False)
+            self.current_bytes -= nbytes
+            self.evictions += 1
+            if self.on_evict:
+                self.on_evict(key, value)
@@ -0,0 +1,67 @@
+import math
+
+EFFECT_DEFAULTS = {
+    "stroke": {"width": 10, "color": "black", "opacity": 1.0},
+    "shadow": {"dx": 6, "dy": 6, "blur": 4, "color": "black", "opacity": 0.6},
+}
+SHADOW_BLUR_EXTENT = 3
+
+_warned_types = set()
+
+
+def normalize_effects(effects):
+    result = []
+    for effect in effects or ():
+        kind = effect.get("type")
+        defaults = EFFECT_DEFAULTS.get(kind)
+        if defaults is None:
+            if kind not in _warned_types:
+                _warned_types.add(kind)
+                print(f"不明な効果のため無視します: {kind}")
+            continue
+        normalized = {"type": kind}
+        for field, default in defaults.items():
+            value = effect.get(field)
+            normalized[field] = default if value is None else value
+        result.append(normalized)
+    return tuple(result)
+
+
+def effects_key(effects):
+    return tuple(tuple(sorted(effect.items())) for effect in effects)
+
+
+def scale_effects(effects, scale):
+    scaled = []
+    for effect in normalize_effects(effects):
+        effect = dict(effect)
+        for field in ("width", "dx", "dy"):
+            if field in effect:
+                effect[field] = round(effect[field] * scale)
+        if "blur" in effect:
+            effect["blur"] = effect["blur"] * scale
+        scaled.append(effect)
+    return tuple(scaled)
+
+
+def effect_shapes(outline_width, effects):
+    width = outline_width
+    shapes = []
+    for effect in effects:
+        if effect["type"] == "stroke":
+            width += max(0, int(effect["width"]))
+            shapes.append((width, 0, 0, 0))
+        else:
+            blur = max(0.0, float(effect["blur"]))
+            shapes.append((width, int(effect["dx"]), int(effect["dy"]), blur))
+    return shapes
+
+
+def shape_margin(blur):
+    return math.ceil(blur * SHADOW_BLUR_EXTENT)
+
+
+def effect_label(effect):
+    if effect["type"] == "stroke":
+        return f"縁 {effect['width']}px {effect['color']}"
+    return f"影 ({effect['dx']}, {effect['dy']}) ぼかし{effect['blur']:g} {effect['color']}"
@@ -0,0 +1,57 @@
+import os
+
+from PIL import Image
+
+from mojist.headless import place_text, save_image
+from mojist.project import project_layers
+from mojist.render import paste_sprite
+
+TILE_HEIGHT = 512
+
+
+def open_source(path, size=None):
+    with Image.open(path) as img:
+        if size is not None:
+            img.draft("RGB", size)
+        img.load()
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info or "A" in img.getbands() else "RGB")
+        if size is not None and img.size != tuple(size):
+            img = img.resize(size, Image.Resampling.BICUBIC, reducing_gap=3.0)
+        return img
+
+
+def composite_tiled(frame, sprites, tile_height=TILE_HEIGHT):
+    for tile_top in range(0, frame.height, tile_height):
+        tile_bottom = min(tile_top + tile_height, frame.height)
+        hits = [
+            (image, left, top) for image, left, top in sprites
+            if top < tile_bottom and top + image.height > tile_top
+            and left < frame.width and left + image.width > 0
+        ]
+        if not hits:
+            continue
+        x0 = max(min(left for _, left, _ in hits), 0)
+        x1 = min(max(left + image.width for image, left, _ in hits), frame.width)
+        tile = frame.crop((x0, tile_top, x1, tile_bottom))
+        if tile.mode != "RGBA":
+            tile = tile.convert("RGBA")
+        for image, left, top in hits:
+            paste_sprite(tile, image, left - x0, top - tile_top)
+        frame.paste(tile if frame.mode == "RGBA" else tile.convert(frame.mode), (x0, tile_top))
+    return frame
+
+
+def export_project(data, output_path, size=None, tile_height=TILE_HEIGHT):
+    layers = project_layers(data)
+    bg_path = layers[0]["background_image_path"]
+    if bg_path and os.path.exists(bg_path):
+        frame = open_source(bg_path, size)
+    else:
+        if bg_path:
+            print(f"背景画像が見つかりませんでした: {bg_path}")
+        frame = Image.new("RGB", tuple(size or layers[0]["canvas_size"]), (128, 128, 128))
+    sprites = [place_text(settings, frame.size) for settings in layers]
+    composite_tiled(frame, sprites, tile_height)
+    save_image(frame, output_path)
+    return frame.size
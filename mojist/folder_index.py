@@ -0,0 +1,227 @@
+import bisect
+import json
+import os
+from pathlib import Path
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg")
+
+
+def _sort_key(rel):
+    return rel.casefold() if os.name == "nt" else rel
+
+
+class FileEntry:
+    __slots__ = ("id", "rel", "path", "mtime_ns", "size", "ino")
+
+    def __init__(self, file_id, rel, path, mtime_ns, size, ino):
+        self.id = file_id
+        self.rel = rel
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.ino = ino
+
+
+class FolderIndex:
+    def __init__(self, root, index_path, suffixes=IMAGE_SUFFIXES):
+        self.root = Path(root)
+        self.index_path = Path(index_path)
+        self.suffixes = tuple(suffixes)
+        self.dirs = {}
+        self.files = {}
+        self.dir_files = {}
+        self.by_id = {}
+        self.next_id = 1
+        self._keys = []
+        self._entries = []
+        self._paths = None
+        self._positions = None
+        self._dirty = False
+        self._changed = False
+        self._removed = {}
+        self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("root") != str(self.root.resolve()):
+            return
+        self.dirs = dict(data.get("dirs", {}))
+        self.next_id = data.get("next_id", 1)
+        for rel, (file_id, mtime_ns, size, ino) in data.get("files", {}).items():
+            self._insert(FileEntry(file_id, rel, self.root / rel, mtime_ns, size, ino))
+
+    def save(self):
+        if not self._dirty:
+            return
+        data = {
+            "root": str(self.root.resolve()),
+            "next_id": self.next_id,
+            "dirs": self.dirs,
+            "files": {e.rel: [e.id, e.mtime_ns, e.size, e.ino] for e in self._entries},
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"画像フォルダ索引の保存失敗: {e}")
+
+    def refresh(self, changed=None):
+        self._changed = False
+        if changed is None or "" not in self.dirs:
+            self._refresh_by_mtime()
+        else:
+            self._refresh_paths(changed)
+        self._match_renames()
+        if self._changed:
+            self._paths = None
+            self._positions = None
+        return self._changed
+
+    def _refresh_by_mtime(self):
+        if "" not in self.dirs:
+            self._scan_dir("")
+        for rel in sorted(self.dirs):
+            if rel not in self.dirs:
+                continue
+            try:
+                mtime_ns = os.stat(self._abs(rel)).st_mtime_ns
+            except OSError:
+                self._drop_dir(rel)
+                continue
+            if mtime_ns != self.dirs[rel]:
+                self._scan_dir(rel)
+
+    def _refresh_paths(self, changed):
+        to_scan = set()
+        for path in changed:
+            rel = self._rel(path)
+            if rel is None:
+                continue
+            if rel in self.dirs or Path(path).is_dir():
+                to_scan.add(rel)
+            if rel:
+                to_scan.add(self._parent(rel))
+        for rel in sorted(to_scan):
+            if rel and not self._abs(rel).is_dir():
+                self._drop_dir(rel)
+            elif rel == "" or self._parent(rel) in self.dirs:
+                self._scan_dir(rel)
+
+    def _scan_dir(self, rel):
+        try:
+            directory = self._abs(rel)
+            mtime_ns = os.stat(directory).st_mtime_ns
+            children = list(os.scandir(directory))
+        except OSError:
+            self._drop_dir(rel)
+            return
+        self.dirs[rel] = mtime_ns
+        self._dirty = True
+
+        seen_files = set()
+        seen_dirs = set()
+        for child in children:
+            child_rel = f"{rel}/{child.name}" if rel else child.name
+            try:
+                if child.is_dir():
+                    seen_dirs.add(child_rel)
+                    if child_rel not in self.dirs:
+                        self._scan_dir(child_rel)
+                    continue
+                if not child.name.lower().endswith(self.suffixes):
+                    continue
+                st = child.stat()
+            except OSError:
+                continue
+            seen_files.add(child_rel)
+            entry = self.files.get(child_rel)
+            if entry is None:
+                self._insert(FileEntry(None, child_rel, self.root / child_rel, st.st_mtime_ns, st.st_size, st.st_ino))
+            else:
+                entry.mtime_ns, entry.size, entry.ino = st.st_mtime_ns, st.st_size, st.st_ino
+
+        for file_rel in self.dir_files.get(rel, set()) - seen_files:
+            self._remove(file_rel)
+        for dir_rel in [d for d in self.dirs if d and self._parent(d) == rel and d not in seen_dirs]:
+            self._drop_dir(dir_rel)
+
+    def _drop_dir(self, rel):
+        prefix = rel + "/"
+        for dir_rel in [d for d in self.dirs if d == rel or d.startswith(prefix)]:
+            del self.dirs[dir_rel]
+            for file_rel in list(self.dir_files.get(dir_rel, ())):
+                self._remove(file_rel)
+        self._dirty = True
+
+    def _insert(self, entry):
+        key = _sort_key(entry.rel)
+        pos = bisect.bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._entries.insert(pos, entry)
+        self.files[entry.rel] = entry
+        self.dir_files.setdefault(self._parent(entry.rel), set()).add(entry.rel)
+        self._changed = True
+        if entry.id is not None:
+            self.by_id[entry.id] = entry
+            self.next_id = max(self.next_id, entry.id + 1)
+
+    def _remove(self, rel):
+        entry = self.files.pop(rel)
+        self.dir_files[self._parent(rel)].discard(rel)
+        pos = bisect.bisect_left(self._keys, _sort_key(rel))
+        del self._keys[pos]
+        del self._entries[pos]
+        self.by_id.pop(entry.id, None)
+        if entry.ino:
+            self._removed[(entry.ino, entry.size, entry.mtime_ns)] = entry.id
+        self._dirty = True
+        self._changed = True
+
+    def _match_renames(self):
+        for entry in self._entries:
+            if entry.id is None:
+                entry.id = self._removed.pop((entry.ino, entry.size, entry.mtime_ns), None)
+                if entry.id is None:
+                    entry.id = self.next_id
+                    self.next_id += 1
+                self.by_id[entry.id] = entry
+                self._dirty = True
+        self._removed.clear()
+
+    def _abs(self, rel):
+        return self.root / rel if rel else self.root
+
+    def _rel(self, path):
+        try:
+            rel = Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+        return "" if rel == "." else rel
+
+    def _parent(self, rel):
+        return rel.rpartition("/")[0]
+
+    def entries(self):
+        return self._entries
+
+    def paths(self):
+        if self._paths is None:
+            self._paths = [e.path for e in self._entries]
+        return self._paths
+
+    def get(self, file_id):
+        return self.by_id.get(file_id)
+
+    def position(self, file_id):
+        if self._positions is None:
+            self._positions = {e.id: i for i, e in enumerate(self._entries)}
+        return self._positions.get(file_id)
@@ -0,0 +1,292 @@
+import bisect
+import json
+import os
+import struct
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import ImageFont
+
+
+def font_dirs():
+    home = Path.home()
+    if sys.platform == "win32":
+        return [
+            Path(os.environ.get("WINDIR", r"C:\Windows")) / "Fonts",
+            Path(os.environ.get("LOCALAPPDATA", "")) / "Microsoft" / "Windows" / "Fonts",
+        ]
+    if sys.platform == "darwin":
+        return [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library" / "Fonts"]
+    return [
+        Path("/usr/share/fonts"), Path("/usr/local/share/fonts"),
+        home / ".local" / "share" / "fonts", home / ".fonts",
+    ]
+
+
+FONT_SUFFIXES = (".ttf", ".otf", ".ttc", ".otc")
+
+
+def default_cache_dir():
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).parent / "Cache"
+    return Path(__file__).resolve().parent.parent / "Cache"
+
+
+def font_dirs_signature():
+    signature = []
+    for directory in font_dirs():
+        if not directory.is_dir():
+            continue
+        for dirpath, _, _ in os.walk(directory):
+            try:
+                signature.append([dirpath, os.stat(dirpath).st_mtime_ns])
+            except OSError:
+                continue
+    return signature
+
+
+class FontFamilyCache:
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data["families"], data["signature"] == font_dirs_signature()
+        except (OSError, ValueError, KeyError):
+            return None, False
+
+    def save(self, families):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump({"signature": font_dirs_signature(), "families": families}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"フォント一覧キャッシュの保存失敗: {e}")
+
+
+class FamilyPrefixIndex:
+    def __init__(self, families):
+        pairs = sorted((f.casefold(), f) for f in families)
+        self.keys = [k for k, _ in pairs]
+        self.names = [n for _, n in pairs]
+
+    def first(self, prefix):
+        prefix = prefix.casefold()
+        i = bisect.bisect_left(self.keys, prefix)
+        if i < len(self.keys) and self.keys[i].startswith(prefix):
+            return self.names[i]
+        return None
+
+
+def _decode_name(platform_id, encoding_id, raw):
+    if platform_id in (0, 3):
+        return raw.decode("utf-16-be", errors="ignore")
+    if platform_id == 1:
+        return raw.decode("shift_jis" if encoding_id == 1 else "mac_roman", errors="ignore")
+    return None
+
+
+def _read_face(f, offset):
+    f.seek(offset + 4)
+    (num_tables,) = struct.unpack(">H", f.read(2))
+    f.seek(offset + 12)
+    tables = {}
+    for _ in range(num_tables):
+        tag, _, table_offset, length = struct.unpack(">4sIII", f.read(16))
+        tables[tag] = (table_offset, length)
+
+    families = set()
+    if b"name" in tables:
+        name_offset, _ = tables[b"name"]
+        f.seek(name_offset)
+        _, count, string_offset = struct.unpack(">HHH", f.read(6))
+        records = [struct.unpack(">HHHHHH", f.read(12)) for _ in range(count)]
+        for platform_id, encoding_id, _, name_id, length, str_offset in records:
+            if name_id not in (1, 16):
+                continue
+            f.seek(name_offset + string_offset + str_offset)
+            name = _decode_name(platform_id, encoding_id, f.read(length))
+            if name:
+                families.add(name.strip())
+
+    weight, italic = 400, False
+    if b"OS/2" in tables:
+        os2_offset, length = tables[b"OS/2"]
+        if length >= 64:
+            f.seek(os2_offset + 4)
+            (weight,) = struct.unpack(">H", f.read(2))
+            f.seek(os2_offset + 62)
+            (fs_selection,) = struct.unpack(">H", f.read(2))
+            italic = bool(fs_selection & 0x01)
+    return families, weight, italic
+
+
+def read_font_faces(path):
+    with open(path, "rb") as f:
+        tag = f.read(4)
+        if tag == b"ttcf":
+            f.seek(8)
+            (count,) = struct.unpack(">I", f.read(4))
+            offsets = struct.unpack(f">{count}I", f.read(4 * count))
+        elif tag in (b"\x00\x01\x00\x00", b"OTTO", b"true"):
+            offsets = (0,)
+        else:
+            return []
+        return [(index,) + _read_face(f, offset) for index, offset in enumerate(offsets)]
+
+
+class FontResolver:
+    def __init__(self, index_path=None):
+        self.index_path = Path(index_path) if index_path else default_cache_dir() / "font_index.json"
+        self.families = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["signature"] == font_dirs_signature():
+                return data["families"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def scan(self):
+        families = {}
+        signature = font_dirs_signature()
+        for directory in font_dirs():
+            for dirpath, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    if not filename.lower().endswith(FONT_SUFFIXES):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    try:
+                        faces = read_font_faces(path)
+                    except (OSError, struct.error):
+                        continue
+                    for index, names, weight, italic in faces:
+                        for name in names:
+                            families.setdefault(name.casefold(), []).append([path, index, weight, italic])
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"signature": signature, "families": families}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"フォント索引の保存失敗: {e}")
+        return families
+
+    def ensure_index(self):
+        with self._lock:
+            if self.families is None:
+                self.families = self._load()
+                if self.families is None:
+                    self.families = self.scan()
+        return self.families
+
+    def resolve(self, family, bold=True):
+        faces = self.ensure_index().get(family.casefold())
+        if not faces:
+            return None
+        target = 700 if bold else 400
+        path, index, _, _ = min(faces, key=lambda face: (face[3], abs(face[2] - target)))
+        return path, index
+
+
+_resolver = FontResolver()
+
+
+def ensure_font_index():
+    _resolver.ensure_index()
+
+
+def font_index_ready():
+    return _resolver.families is not None
+
+
+def _windows_font_entries():
+    import winreg
+
+    key_path = r"SOFTWARE\Microsoft\Windows NT\CurrentVersion\Fonts"
+    dirs = font_dirs()
+    for hive in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+        try:
+            key = winreg.OpenKey(hive, key_path)
+        except OSError:
+            continue
+        with key:
+            i = 0
+            while True:
+                try:
+                    name, value, _ = winreg.EnumValue(key, i)
+                except OSError:
+                    break
+                i += 1
+                path = Path(value)
+                if not path.is_absolute():
+                    path = next((d / value for d in dirs if (d / value).exists()), dirs[0] / value)
+                names = name.rsplit(" (", 1)[0].split(" & ")
+                yield [n.strip() for n in names], path
+
+
+def _find_windows(family, bold):
+    wanted = [f"{family} Bold", family] if bold else [family]
+    candidates = {}
+    for names, path in _windows_font_entries():
+        for index, name in enumerate(names):
+            if name in wanted and name not in candidates:
+                candidates[name] = (str(path), index if path.suffix.lower() == ".ttc" else 0)
+    return next((candidates[n] for n in wanted if n in candidates), None)
+
+
+def _find_fontconfig(family, bold):
+    import subprocess
+
+    pattern = f"{family}:weight=bold" if bold else family
+    try:
+        out = subprocess.run(
+            ["fc-match", "-f", "%{family}\n%{file}\n%{index}", pattern],
+            capture_output=True, text=True, timeout=5
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    lines = out.split("\n")
+    if len(lines) < 3 or family not in lines[0].split(","):
+        return None
+    return lines[1], int(lines[2] or 0)
+
+
+@lru_cache(maxsize=256)
+def find_font_file(family, bold=True):
+    try:
+        found = _resolver.resolve(family, bold)
+        if found is not None:
+            return found
+        if sys.platform == "win32":
+            return _find_windows(family, bold) or (_find_windows(family, False) if bold else None)
+        return _find_fontconfig(family, bold)
+    except Exception as e:
+        print(f"フォントファイル検索失敗: {family}: {e}")
+        return None
+
+
+@lru_cache(maxsize=64)
+def load_face(path, index, pixel_size):
+    return ImageFont.truetype(path, pixel_size, index=index)
+
+
+def load_font(family, pixel_size, bold=True):
+    found = find_font_file(family, bold)
+    if found is None:
+        return None
+    path, index = found
+    try:
+        return load_face(path, index, pixel_size)
+    except OSError as e:
+        print(f"フォント読み込み失敗: {path}: {e}")
+        return None
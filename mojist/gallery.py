@@ -0,0 +1,187 @@
+import math
+import tkinter as tk
+
+from PIL import ImageTk
+
+
+class VirtualGallery(tk.Frame):
+    def __init__(self, parent, loader, thumb_size, columns=3, on_select=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.loader = loader
+        self.thumb_w, self.thumb_h = thumb_size
+        self.columns = columns
+        self.on_select = on_select
+        self.pad = 6
+        self.label_h = 30
+        self.cell_w = self.thumb_w + self.pad * 2
+        self.cell_h = self.thumb_h + self.label_h + self.pad * 2
+
+        self.paths = []
+        self.visible = []
+        self.filter_text = ""
+        self.selected_index = None
+        self.cells = []
+        self.layout_job = None
+
+        self.canvas = tk.Canvas(
+            self, width=self.cell_w * columns, highlightthickness=0,
+            yscrollincrement=1
+        )
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.canvas.configure(yscrollcommand=self._on_yscroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self._schedule_layout())
+        toplevel = self.winfo_toplevel()
+        toplevel.bind("<MouseWheel>", self._on_wheel, add="+")
+        toplevel.bind("<Button-4>", lambda e: self._scroll_units(-1), add="+")
+        toplevel.bind("<Button-5>", lambda e: self._scroll_units(1), add="+")
+
+    def set_items(self, paths):
+        self.paths = list(paths)
+        self._apply_filter()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip().lower()
+        self._apply_filter()
+
+    def select(self, index):
+        self.selected_index = index
+        for cell in self.cells:
+            self._draw_highlight(cell)
+
+    def see(self, index):
+        try:
+            pos = self.visible.index(index)
+        except ValueError:
+            return
+        top = (pos // self.columns) * self.cell_h
+        view_h = self.canvas.winfo_height()
+        first, _ = self.canvas.yview()
+        current = first * self._total_height()
+        if top < current or top + self.cell_h > current + view_h:
+            self.canvas.yview_moveto(top / max(self._total_height(), 1))
+        self._schedule_layout()
+
+    def _apply_filter(self):
+        if self.filter_text:
+            self.visible = [i for i, p in enumerate(self.paths) if self.filter_text in p.name.lower()]
+        else:
+            self.visible = list(range(len(self.paths)))
+        self.canvas.configure(scrollregion=(0, 0, self.cell_w * self.columns, self._total_height()))
+        self.canvas.yview_moveto(0)
+        for cell in self.cells:
+            cell["index"] = None
+        self._schedule_layout()
+
+    def _total_height(self):
+        return math.ceil(len(self.visible) / self.columns) * self.cell_h
+
+    def _yview(self, *args):
+        self.canvas.yview(*args)
+        self._schedule_layout()
+
+    def _on_yscroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._schedule_layout()
+
+    def _on_wheel(self, event):
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _scroll_units(self, direction):
+        self.canvas.yview_scroll(direction * (self.cell_h // 3), "units")
+        self._schedule_layout()
+
+    def _schedule_layout(self):
+        if self.layout_job is None:
+            self.layout_job = self.after_idle(self._layout)
+
+    def _ensure_pool(self, rows):
+        needed = (rows + 1) * self.columns
+        while len(self.cells) < needed:
+            n = len(self.cells)
+            tag = f"cell{n}"
+            cell = {
+                "index": None,
+                "photo": None,
+                "frame": self.canvas.create_rectangle(0, 0, 0, 0, outline="black", fill="#c8c8c8", tags=tag),
+                "image": self.canvas.create_image(0, 0, anchor=tk.NW, tags=tag),
+                "label": self.canvas.create_text(0, 0, anchor=tk.N, width=self.thumb_w, tags=tag),
+            }
+            self.canvas.tag_bind(tag, "<Button-1>", lambda e, c=cell: self._on_click(c))
+            self.canvas.tag_bind(tag, "<Enter>", lambda e: self.canvas.config(cursor="hand2"))
+            self.canvas.tag_bind(tag, "<Leave>", lambda e: self.canvas.config(cursor=""))
+            self.cells.append(cell)
+
+    def _layout(self):
+        self.layout_job = None
+        view_h = max(self.canvas.winfo_height(), self.cell_h)
+        rows = math.ceil(view_h / self.cell_h)
+        self._ensure_pool(rows)
+
+        top = self.canvas.canvasy(0)
+        first_row = max(int(top // self.cell_h), 0)
+        first_pos = first_row * self.columns
+        wanted = self.visible[first_pos:first_pos + len(self.cells)]
+
+        self.loader.cancel_pending()
+        for slot, cell in enumerate(self.cells):
+            if slot >= len(wanted):
+                cell["index"] = None
+                cell["photo"] = None
+                self.canvas.itemconfigure(cell["frame"], state=tk.HIDDEN)
+                self.canvas.itemconfigure(cell["image"], state=tk.HIDDEN, image="")
+                self.canvas.itemconfigure(cell["label"], state=tk.HIDDEN)
+                continue
+            pos = first_pos + slot
+            x = (pos % self.columns) * self.cell_w + self.pad
+            y = (pos // self.columns) * self.cell_h + self.pad
+            self.canvas.coords(cell["frame"], x - 2, y - 2, x + self.thumb_w + 1, y + self.thumb_h + 1)
+            self.canvas.coords(cell["image"], x, y)
+            self.canvas.coords(cell["label"], x + self.thumb_w // 2, y + self.thumb_h + 3)
+            for key in ("frame", "image", "label"):
+                self.canvas.itemconfigure(cell[key], state=tk.NORMAL)
+
+            index = wanted[slot]
+            if cell["index"] != index:
+                cell["index"] = index
+                cell["photo"] = None
+                self.canvas.itemconfigure(cell["image"], image="")
+                self.canvas.itemconfigure(cell["label"], text=self._short_name(self.paths[index].name))
+            self._draw_highlight(cell)
+            if cell["photo"] is None:
+                self.loader.request(self.paths[index], lambda img, c=cell, i=index: self._show_thumb(c, i, img))
+
+        page = len(self.cells)
+        ahead = self.visible[first_pos + page:first_pos + page * 2]
+        behind = self.visible[max(first_pos - page, 0):first_pos]
+        self.loader.prefetch([self.paths[i] for i in ahead + behind])
+
+    def _show_thumb(self, cell, index, img):
+        if img is None or cell["index"] != index or not self.winfo_exists():
+            return
+        cell["photo"] = ImageTk.PhotoImage(img)
+        cell["photo_bytes"] = img.width * img.height * 4
+        self.canvas.itemconfigure(cell["image"], image=cell["photo"])
+
+    def photo_bytes(self):
+        return sum(cell.get("photo_bytes", 0) for cell in self.cells if cell["photo"] is not None)
+
+    def _draw_highlight(self, cell):
+        selected = cell["index"] is not None and cell["index"] == self.selected_index
+        self.canvas.itemconfigure(
+            cell["frame"],
+            outline="#008000" if selected else "black",
+            width=3 if selected else 1
+        )
+
+    def _on_click(self, cell):
+        if cell["index"] is None:
+            return
+        self.select(cell["index"])
+        if self.on_select:
+            self.on_select(cell["index"])
+
+    def _short_name(self, name):
+        return name if len(name) <= 40 else name[:38] + "…"
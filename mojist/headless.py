@@ -0,0 +1,88 @@
+import math
+import os
+
+from PIL import Image, ImageFont
+
+from mojist.cache import LRUCache
+from mojist.effects import scale_effects
+from mojist.fonts import load_font
+from mojist.project import PREVIEW_HEIGHT, PREVIEW_WIDTH, project_layers
+from mojist.render import paste_sprite, render_text_sprite
+
+BACKGROUND_CACHE_BYTES = 512 * 1024 * 1024
+
+_backgrounds = LRUCache(
+    BACKGROUND_CACHE_BYTES,
+    lambda img: img.width * img.height * len(img.getbands())
+)
+
+_missing_fonts = set()
+
+
+def limit_background_cache(max_bytes):
+    _backgrounds.max_bytes = max_bytes
+
+
+def load_background(path):
+    if not path or not os.path.exists(path):
+        if path:
+            print(f"背景画像が見つかりませんでした: {path}")
+        return Image.new("RGBA", (PREVIEW_WIDTH, PREVIEW_HEIGHT), (128, 128, 128, 255))
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    img = _backgrounds.get(key)
+    if img is None:
+        with Image.open(path) as src:
+            img = src.convert("RGBA")
+        _backgrounds.put(key, img)
+    return img
+
+
+def load_text_font(family, pixel_size):
+    font = load_font(family, pixel_size) if family else None
+    if font is None:
+        if family not in _missing_fonts:
+            _missing_fonts.add(family)
+            print(f"フォントが見つからないため既定のフォントで描画します: {family}")
+        font = ImageFont.load_default(pixel_size)
+    return font
+
+
+def render_scale(size, canvas_size=(PREVIEW_WIDTH, PREVIEW_HEIGHT)):
+    sx = size[0] / canvas_size[0]
+    sy = size[1] / canvas_size[1]
+    return sx, sy, math.sqrt(sx * sy)
+
+
+def place_text(settings, frame_size, text=None):
+    sx, sy, scale = render_scale(frame_size, settings["canvas_size"])
+    pixel_size = max(1, round(settings["font_size"] * settings["pixels_per_point"] * scale))
+    font = load_text_font(settings["font_name"], pixel_size)
+    rendered = render_text_sprite(
+        text or settings["text"], font, settings["text_color"], settings["outline_color"],
+        round(settings["outline_width"] * scale), scale_effects(settings["effects"], scale)
+    )
+    left, top, _, _ = rendered.sprite.bbox(round(settings["x"] * sx), round(settings["y"] * sy))
+    return rendered.image, left, top
+
+
+def render_layers(frame, layers):
+    for settings in layers:
+        image, left, top = place_text(settings, frame.size)
+        paste_sprite(frame, image, left, top)
+    return frame
+
+
+def render_project(data, size=None):
+    layers = project_layers(data)
+    background = load_background(layers[0]["background_image_path"])
+    frame = background.copy() if size is None else background.resize(size)
+    return render_layers(frame, layers)
+
+
+def save_image(image, path, quality=95):
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix in (".jpg", ".jpeg"):
+        image.convert("RGB").save(path, quality=quality)
+    else:
+        image.save(path)
@@ -0,0 +1,175 @@
+import itertools
+import sys
+import time
+from collections import deque
+
+MISSING = object()
+
+STEP_OVERHEAD = 128
+_SCALARS = (str, int, float, bool, tuple, type(None))
+
+
+class HistoryStep:
+    def __init__(self, seq, changes, group):
+        self.seq = seq
+        self.changes = changes
+        self.group = group
+        self.time = time.monotonic()
+
+
+class History:
+    def __init__(self, max_bytes=64 * 1024 * 1024, coalesce_seconds=1.2, counted_elsewhere=None):
+        self.max_bytes = max_bytes
+        self.coalesce_seconds = coalesce_seconds
+        self.counted_elsewhere = counted_elsewhere
+        self.undo_steps = deque()
+        self.redo_steps = []
+        self.state = {}
+        self._own_bytes = 0
+        self._shared = {}
+        self._seq = itertools.count(1)
+        self._group_open = False
+        self.budget = None
+
+    def reset(self, state):
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+        self._shared.clear()
+        self._own_bytes = 0
+        self.state = dict(state)
+        self._group_open = False
+
+    def amend(self, state):
+        self.state = dict(state)
+
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def mark(self):
+        return self.undo_steps[-1].seq if self.undo_steps else 0
+
+    def break_group(self):
+        self._group_open = False
+
+    def commit(self, state, group=None):
+        changes = {}
+        for key in self.state.keys() | state.keys():
+            old = self.state.get(key, MISSING)
+            new = state.get(key, MISSING)
+            if old is not new and old != new:
+                changes[key] = (old, new)
+        if not changes:
+            return False
+        self.state = dict(state)
+
+        for step in self.redo_steps:
+            self._account(step, -1)
+        self.redo_steps.clear()
+
+        last = self.undo_steps[-1] if self.undo_steps else None
+        if (
+            group is not None and self._group_open and last is not None and last.group == group
+            and time.monotonic() - last.time < self.coalesce_seconds
+        ):
+            self._account(last, -1)
+            for key, (old, new) in changes.items():
+                if key in last.changes:
+                    old = last.changes[key][0]
+                if old is new or old == new:
+                    last.changes.pop(key, None)
+                else:
+                    last.changes[key] = (old, new)
+            last.time = time.monotonic()
+            if last.changes:
+                self._account(last, 1)
+            else:
+                self.undo_steps.pop()
+        else:
+            step = HistoryStep(next(self._seq), changes, group)
+            self.undo_steps.append(step)
+            self._account(step, 1)
+        self._group_open = group is not None
+        self._trim()
+        if self.budget is not None:
+            self.budget.enforce()
+        return True
+
+    def undo(self):
+        if not self.undo_steps:
+            return None
+        step = self.undo_steps.pop()
+        self.redo_steps.append(step)
+        self._group_open = False
+        return self._apply(step, 0)
+
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        step = self.redo_steps.pop()
+        self.undo_steps.append(step)
+        self._group_open = False
+        return self._apply(step, 1)
+
+    def rollback(self, mark, state):
+        while self.undo_steps and self.undo_steps[-1].seq > mark:
+            self._account(self.undo_steps.pop(), -1)
+        self.state = dict(state)
+        self._group_open = False
+
+    def _apply(self, step, side):
+        for key, values in step.changes.items():
+            value = values[side]
+            if value is MISSING:
+                self.state.pop(key, None)
+            else:
+                self.state[key] = value
+        return dict(self.state)
+
+    @property
+    def current_bytes(self):
+        shared = 0
+        for value, _ in self._shared.values():
+            if self.counted_elsewhere is None or not self.counted_elsewhere(value):
+                shared += getattr(value, "nbytes", sys.getsizeof(value))
+        return self._own_bytes + shared
+
+    def _account(self, step, sign):
+        nbytes = STEP_OVERHEAD
+        for old, new in step.changes.values():
+            for value in (old, new):
+                if value is MISSING or isinstance(value, _SCALARS):
+                    nbytes += sys.getsizeof(value)
+                    continue
+                entry = self._shared.get(id(value))
+                if sign > 0:
+                    if entry is None:
+                        self._shared[id(value)] = [value, 1]
+                    else:
+                        entry[1] += 1
+                else:
+                    entry[1] -= 1
+                    if entry[1] == 0:
+                        del self._shared[id(value)]
+        self._own_bytes += sign * nbytes
+
+    def evict_oldest(self):
+        if len(self.undo_steps) <= 1:
+            return 0
+        before = self.current_bytes
+        self._account(self.undo_steps.popleft(), -1)
+        return before - self.current_bytes
+
+    def _trim(self):
+        while self.current_bytes > self.max_bytes and self.evict_oldest():
+            pass
+
+    def stats(self):
+        return {
+            "undo": len(self.undo_steps),
+            "redo": len(self.redo_steps),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,89 @@
+import itertools
+
+from mojist.effects import effects_key, normalize_effects
+from mojist.project import LAYER_FIELDS
+
+_layer_ids = itertools.count(1)
+
+
+class TextLayer:
+    def __init__(self, text=None, font_name=None, font_size=50, text_color="white",
+                 outline_color="black", outline_width=2, effects=(), x=512, y=502, layer_id=None):
+        self.id = layer_id or next(_layer_ids)
+        self.tag = f"layer{self.id}"
+        self.text = text
+        self.font_name = font_name
+        self.font_size = font_size
+        self.text_color = text_color
+        self.outline_color = outline_color
+        self.outline_width = outline_width
+        self.effects = normalize_effects(effects)
+        self.x, self.y = x, y
+
+        self.item = None
+        self.photo = None
+        self.sprite = None
+        self.sprite_text = None
+        self.origin = None
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(**{field: settings[field] for field in LAYER_FIELDS})
+
+    def style_key(self, text):
+        return (
+            text, self.font_name, self.font_size, self.text_color, self.outline_color, self.outline_width,
+            effects_key(self.effects)
+        )
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in LAYER_FIELDS}
+
+    def forget_render(self):
+        self.item = None
+        self.photo = None
+        self.sprite = None
+        self.sprite_text = None
+        self.origin = None
+
+
+class LayerStack:
+    def __init__(self, layers):
+        self.layers = list(layers)
+        self.active_index = 0
+
+    def __iter__(self):
+        return iter(self.layers)
+
+    def __len__(self):
+        return len(self.layers)
+
+    def __contains__(self, layer):
+        return any(layer is l for l in self.layers)
+
+    def __getitem__(self, index):
+        return self.layers[index]
+
+    @property
+    def active(self):
+        return self.layers[self.active_index]
+
+    def index(self, layer):
+        return next(i for i, l in enumerate(self.layers) if l is layer)
+
+    def add(self, layer):
+        self.layers.insert(self.active_index + 1, layer)
+        self.active_index += 1
+        return layer
+
+    def remove(self, layer):
+        if len(self.layers) <= 1:
+            return False
+        index = self.index(layer)
+        del self.layers[index]
+        if index <= self.active_index and self.active_index > 0:
+            self.active_index -= 1
+        return True
+
+    def above(self, layer):
+        return self.layers[self.index(layer) + 1:]
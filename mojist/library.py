@@ -0,0 +1,164 @@
+import io
+import os
+import sqlite3
+from pathlib import Path
+
+from mojist.project import project_layers, project_settings, read_project
+
+PREVIEW_SIZE = (256, 144)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    text TEXT,
+    font_name TEXT,
+    font_size INTEGER,
+    text_color TEXT,
+    outline_color TEXT,
+    outline_width INTEGER,
+    background_image_path TEXT
+);
+CREATE TABLE IF NOT EXISTS previews (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    png BLOB NOT NULL
+);
+"""
+
+FIELDS = ("text", "font_name", "font_size", "text_color", "outline_color", "outline_width", "background_image_path")
+
+
+class ProjectLibrary:
+    def __init__(self, db_path, projects_dir):
+        self.db_path = Path(db_path)
+        self.projects_dir = Path(projects_dir)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+        self.fts = self._create_fts()
+
+    def _create_fts(self):
+        try:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts "
+                "USING fts5(text, path UNINDEXED, tokenize='trigram')"
+            )
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def close(self):
+        self.conn.close()
+
+    def _scan(self):
+        found = {}
+        stack = [self.projects_dir]
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.name.lower().endswith(".json"):
+                        st = entry.stat()
+                        found[os.path.abspath(entry.path)] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def sync(self):
+        found = self._scan()
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in self.conn.execute("SELECT path, mtime_ns, size FROM projects")}
+        removed = [path for path in known if path not in found]
+        changed = [path for path, stamp in found.items() if known.get(path) != stamp]
+        with self.conn:
+            for path in removed:
+                self._delete(path)
+            for path in changed:
+                self._upsert(path, *found[path])
+        return len(changed) + len(removed)
+
+    def update_file(self, path):
+        path = os.path.abspath(path)
+        with self.conn:
+            try:
+                st = os.stat(path)
+            except OSError:
+                self._delete(path)
+                return
+            self._upsert(path, st.st_mtime_ns, st.st_size)
+
+    def _delete(self, path):
+        self.conn.execute("DELETE FROM projects WHERE path = ?", (path,))
+        self.conn.execute("DELETE FROM previews WHERE path = ?", (path,))
+        if self.fts:
+            self.conn.execute("DELETE FROM projects_fts WHERE path = ?", (path,))
+
+    def _upsert(self, path, mtime_ns, size):
+        try:
+            data = read_project(path)
+            settings = project_settings(data)
+            settings["text"] = "\n".join(layer["text"] for layer in project_layers(data))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"プロジェクトの索引作成に失敗しました: {path}: {e}")
+            settings = {field: None for field in FIELDS}
+        values = [settings.get(field) for field in FIELDS]
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO projects (path, mtime_ns, size, {', '.join(FIELDS)}) "
+            f"VALUES (?, ?, ?, {', '.join('?' * len(FIELDS))})",
+            [path, mtime_ns, size] + values
+        )
+        if self.fts:
+            self.conn.execute("DELETE FROM projects_fts WHERE path = ?", (path,))
+            self.conn.execute("INSERT INTO projects_fts (text, path) VALUES (?, ?)", (settings.get("text") or "", path))
+
+    def search(self, query="", limit=1000):
+        columns = "p.path, p.mtime_ns, " + ", ".join(f"p.{f}" for f in FIELDS)
+        query = query.strip()
+        if not query:
+            sql = f"SELECT {columns} FROM projects p ORDER BY p.mtime_ns DESC LIMIT ?"
+            params = (limit,)
+        elif self.fts and len(query) >= 3:
+            sql = (
+                f"SELECT {columns} FROM projects_fts f JOIN projects p ON p.path = f.path "
+                "WHERE projects_fts MATCH ? ORDER BY rank LIMIT ?"
+            )
+            params = ('"' + query.replace('"', '""') + '"', limit)
+        else:
+            escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            sql = f"SELECT {columns} FROM projects p WHERE p.text LIKE ? ESCAPE '\\' ORDER BY p.mtime_ns DESC LIMIT ?"
+            params = (f"%{escaped}%", limit)
+        keys = ("path", "mtime_ns") + FIELDS
+        return [dict(zip(keys, row)) for row in self.conn.execute(sql, params)]
+
+    def get_preview(self, path, mtime_ns):
+        row = self.conn.execute("SELECT mtime_ns, png FROM previews WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == mtime_ns:
+            return row[1]
+        return None
+
+    def put_preview(self, path, mtime_ns, png):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO previews (path, mtime_ns, png) VALUES (?, ?, ?)", (path, mtime_ns, png))
+
+
+def render_preview_png(project_path, size=PREVIEW_SIZE):
+    from mojist.backgrounds import decode_preview
+    from mojist.headless import render_layers
+    from PIL import Image
+
+    layers = project_layers(read_project(project_path))
+    bg_path = layers[0]["background_image_path"]
+    if bg_path and os.path.exists(bg_path):
+        frame = decode_preview(bg_path, size).convert("RGBA")
+    else:
+        frame = Image.new("RGBA", size, (128, 128, 128, 255))
+    render_layers(frame, layers)
+    buffer = io.BytesIO()
+    frame.convert("RGB").save(buffer, "PNG")
+    return buffer.getvalue()
@@ -0,0 +1,171 @@
+import io
+import queue
+import time
+import tkinter as tk
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tkinter import ttk
+
+from PIL import Image, ImageTk
+
+from mojist.library import PREVIEW_SIZE, render_preview_png
+
+
+class ProjectLibraryWindow:
+    def __init__(self, root, library, on_open, on_select=None):
+        self.library = library
+        self.on_open = on_open
+        self.on_select = on_select
+        self.rows = {}
+        self.preview_photo = None
+        self.search_job = None
+        self.poll_job = None
+        self.results = queue.SimpleQueue()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="project-preview")
+        self.rendering = set()
+
+        self.window = tk.Toplevel(root)
+        self.window.title("プロジェクト一覧")
+        self.window.geometry("820x480")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        search_frame = tk.Frame(self.window)
+        search_frame.pack(fill=tk.X, padx=10, pady=5)
+        tk.Label(search_frame, text="検索:").pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._schedule_search())
+        search_entry = tk.Entry(search_frame, textvariable=self.search_var, width=40)
+        search_entry.pack(side=tk.LEFT, padx=5)
+        search_entry.focus_set()
+        tk.Button(search_frame, text="🔄 再読み込み", command=self.refresh).pack(side=tk.RIGHT)
+        self.count_label = tk.Label(search_frame, text="")
+        self.count_label.pack(side=tk.RIGHT, padx=10)
+
+        body = tk.Frame(self.window)
+        body.pack(expand=True, fill=tk.BOTH, padx=10, pady=(0, 10))
+
+        side = tk.Frame(body, width=PREVIEW_SIZE[0] + 10)
+        side.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0))
+        preview_frame = tk.Frame(side, width=PREVIEW_SIZE[0], height=PREVIEW_SIZE[1], bg="#c8c8c8")
+        preview_frame.pack_propagate(False)
+        preview_frame.pack()
+        self.preview_label = tk.Label(preview_frame, bg="#c8c8c8")
+        self.preview_label.pack(expand=True, fill=tk.BOTH)
+        self.detail_label = tk.Label(side, text="", justify=tk.LEFT, anchor=tk.W, wraplength=PREVIEW_SIZE[0])
+        self.detail_label.pack(fill=tk.X, pady=5)
+        tk.Button(side, text="開く", width=10, command=self._open_selected).pack(side=tk.BOTTOM, anchor=tk.E)
+
+        self.tree = ttk.Treeview(body, columns=("text", "font", "updated"), show="headings", selectmode="browse")
+        self.tree.heading("text", text="テキスト")
+        self.tree.heading("font", text="フォント")
+        self.tree.heading("updated", text="更新日時")
+        self.tree.column("text", width=240)
+        self.tree.column("font", width=120)
+        self.tree.column("updated", width=120)
+        scrollbar = tk.Scrollbar(body, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, expand=True, fill=tk.BOTH)
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._show_selected())
+        self.tree.bind("<Double-Button-1>", lambda e: self._open_selected())
+        self.tree.bind("<Return>", lambda e: self._open_selected())
+
+        self.refresh()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def lift(self):
+        self.window.lift()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.poll_job is not None:
+            self.window.after_cancel(self.poll_job)
+            self.poll_job = None
+        if self.window.winfo_exists():
+            self.window.destroy()
+
+    def refresh(self):
+        self.library.sync()
+        self._search()
+
+    def _schedule_search(self):
+        if self.search_job is not None:
+            self.window.after_cancel(self.search_job)
+        self.search_job = self.window.after(150, self._search)
+
+    def _search(self):
+        self.search_job = None
+        rows = self.library.search(self.search_var.get())
+        self.tree.delete(*self.tree.get_children())
+        self.rows = {}
+        for row in rows:
+            updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["mtime_ns"] / 1e9))
+            text = (row["text"] or "").replace("\n", " ")
+            iid = self.tree.insert("", tk.END, values=(text, row["font_name"] or "", updated))
+            self.rows[iid] = row
+        self.count_label.config(text=f"{len(rows)} 件")
+
+    def _selected_row(self):
+        selection = self.tree.selection()
+        return self.rows.get(selection[0]) if selection else None
+
+    def _show_selected(self):
+        row = self._selected_row()
+        if row is None:
+            return
+        self.detail_label.config(text=(
+            f"{Path(row['path']).name}\n"
+            f"フォント: {row['font_name']} {row['font_size']}\n"
+            f"背景: {Path(row['background_image_path'] or '-').name}"
+        ))
+        if self.on_select:
+            self.on_select(row)
+        png = self.library.get_preview(row["path"], row["mtime_ns"])
+        if png is not None:
+            self._set_preview(png)
+            return
+        self.preview_photo = None
+        self.preview_label.config(image="")
+        key = (row["path"], row["mtime_ns"])
+        if key not in self.rendering:
+            self.rendering.add(key)
+            self.executor.submit(self._render, key)
+            if self.poll_job is None:
+                self.poll_job = self.window.after(30, self._poll)
+
+    def _render(self, key):
+        try:
+            self.results.put((key, render_preview_png(key[0]), None))
+        except Exception:
+            self.results.put((key, None, traceback.format_exc()))
+
+    def _poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                key, png, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.rendering.discard(key)
+            if error:
+                print(f"プレビュー生成失敗: {key[0]}\n{error}")
+                continue
+            self.library.put_preview(key[0], key[1], png)
+            row = self._selected_row()
+            if row and (row["path"], row["mtime_ns"]) == key:
+                self._set_preview(png)
+        if self.rendering:
+            self.poll_job = self.window.after(30, self._poll)
+
+    def _set_preview(self, png):
+        with Image.open(io.BytesIO(png)) as img:
+            self.preview_photo = ImageTk.PhotoImage(img)
+        self.preview_label.config(image=self.preview_photo)
+
+    def _open_selected(self):
+        row = self._selected_row()
+        if row is not None:
+            self.on_open(row["path"])
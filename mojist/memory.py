@@ -0,0 +1,84 @@
+import threading
+import tkinter as tk
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class MemoryBudget:
+    def __init__(self, max_bytes=DEFAULT_BUDGET):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.entries = {}
+        self.gauges = {}
+        self._lock = threading.RLock()
+
+    def register(self, name, cache, priority=0, main_thread_only=False):
+        with self._lock:
+            self.entries[name] = (cache, priority, main_thread_only)
+            cache.budget = self
+        self.enforce()
+        return cache
+
+    def gauge(self, name, measure):
+        with self._lock:
+            self.gauges[name] = measure
+
+    def usage(self):
+        with self._lock:
+            usage = {name: cache.current_bytes for name, (cache, _, _) in self.entries.items()}
+            for name, measure in self.gauges.items():
+                usage[name] = measure()
+        return usage
+
+    @property
+    def current_bytes(self):
+        return sum(self.usage().values())
+
+    def enforce(self):
+        on_main = threading.current_thread() is threading.main_thread()
+        with self._lock:
+            total = self.current_bytes
+            exhausted = set()
+            while total > self.max_bytes:
+                name = self._victim(on_main, exhausted)
+                if name is None:
+                    break
+                freed = self.entries[name][0].evict_oldest()
+                if not freed:
+                    exhausted.add(name)
+                    continue
+                self.evictions += 1
+                total -= freed
+
+    def _victim(self, on_main, exhausted=()):
+        candidates = [
+            (priority, -cache.current_bytes, name)
+            for name, (cache, priority, main_thread_only) in self.entries.items()
+            if name not in exhausted and cache.current_bytes > 0 and (on_main or not main_thread_only)
+        ]
+        if not candidates:
+            return None
+        return min(candidates)[2]
+
+    def stats(self):
+        caches = {}
+        with self._lock:
+            for name, (cache, priority, _) in self.entries.items():
+                caches[name] = dict(cache.stats(), priority=priority)
+            for name, measure in self.gauges.items():
+                caches[name] = {"bytes": measure()}
+        return {
+            "bytes": sum(info["bytes"] for info in caches.values()),
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "caches": caches,
+        }
+
+
+def release_photo(widget, photo):
+    if photo is None:
+        return
+    try:
+        widget.tk.call("image", "delete", str(photo))
+    except tk.TclError:
+        pass
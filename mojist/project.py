@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+PREVIEW_WIDTH, PREVIEW_HEIGHT = 1024, 576
+DEFAULT_PIXELS_PER_POINT = 96 / 72
+
+PROJECT_DEFAULTS = {
+    "text": "文字",
+    "font_name": None,
+    "font_size": 50,
+    "text_color": "white",
+    "outline_color": "black",
+    "outline_width": 2,
+    "effects": [],
+    "x": 512,
+    "y": 502,
+    "background_image_path": "",
+    "pixels_per_point": DEFAULT_PIXELS_PER_POINT,
+    "canvas_size": [PREVIEW_WIDTH, PREVIEW_HEIGHT],
+}
+
+LAYER_FIELDS = ("text", "font_name", "font_size", "text_color", "outline_color", "outline_width", "effects", "x", "y")
+
+
+def read_project(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("プロジェクトの形式が正しくありません")
+    layers = data.get("layers")
+    if layers is not None and not (isinstance(layers, list) and all(isinstance(layer, dict) for layer in layers)):
+        raise ValueError("レイヤーの形式が正しくありません")
+    return data
+
+
+def write_project(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+
+
+def project_settings(data):
+    settings = dict(PROJECT_DEFAULTS)
+    settings.update({k: v for k, v in data.items() if v is not None})
+    settings["text"] = settings["text"] or PROJECT_DEFAULTS["text"]
+    return settings
+
+
+def project_layers(data):
+    layers = data.get("layers")
+    if not layers:
+        return [project_settings(data)]
+    base = project_settings({k: v for k, v in data.items() if k != "layers"})
+    result = []
+    for layer in layers:
+        settings = dict(base)
+        settings.update({k: v for k, v in layer.items() if k in LAYER_FIELDS and v is not None})
+        settings["text"] = settings["text"] or PROJECT_DEFAULTS["text"]
+        result.append(settings)
+    return result
+
+
+def find_projects(folder):
+    return sorted(p for p in Path(folder).rglob("*.json") if p.is_file())
@@ -0,0 +1,121 @@
+import math
+
+from PIL import Image, ImageColor, ImageDraw, ImageFilter
+
+from mojist.effects import effect_shapes, normalize_effects, shape_margin
+
+SHADOW_REDUCE_BLUR = 3
+SHADOW_MAX_REDUCE = 4
+
+
+def to_rgb(color):
+    return ImageColor.getrgb(color)[:3]
+
+
+class TextSprite:
+    def __init__(self, fill_mask, outer_mask, offset_x, offset_y, effect_masks=()):
+        self.fill_mask = fill_mask
+        self.outer_mask = outer_mask
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.effect_masks = list(effect_masks)
+
+    @property
+    def size(self):
+        return self.outer_mask.size
+
+    def bbox(self, x, y):
+        w, h = self.size
+        return (x + self.offset_x, y + self.offset_y, x + self.offset_x + w, y + self.offset_y + h)
+
+    def compose(self, text_color, outline_color, effects=()):
+        fill = Image.new("RGB", self.size, to_rgb(text_color))
+        outline = Image.new("RGB", self.size, to_rgb(outline_color))
+        image = Image.composite(fill, outline, self.fill_mask)
+        image.putalpha(self.outer_mask)
+        for mask, effect in zip(self.effect_masks, effects):
+            opacity = max(0.0, min(1.0, float(effect["opacity"])))
+            if opacity < 1.0:
+                mask = mask.point(lambda v: round(v * opacity))
+            layer = Image.new("RGB", self.size, to_rgb(effect["color"]))
+            layer.putalpha(mask)
+            layer.alpha_composite(image)
+            image = layer
+        return image
+
+
+class RenderedText:
+    def __init__(self, sprite, image):
+        self.sprite = sprite
+        self.image = image
+        self.photo = None
+
+    @property
+    def nbytes(self):
+        w, h = self.sprite.size
+        masks = 1 if self.sprite.outer_mask is self.sprite.fill_mask else 2
+        return w * h * (4 + 4 + masks + len(self.sprite.effect_masks))
+
+
+def _shape_mask(size, origin, text, font, width):
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).text(origin, text, font=font, fill=255, anchor="mm", stroke_width=width, stroke_fill=255)
+    return mask
+
+
+def _blur_mask(mask, blur):
+    factor = min(SHADOW_MAX_REDUCE, int(blur // SHADOW_REDUCE_BLUR))
+    if factor < 2:
+        return mask.filter(ImageFilter.GaussianBlur(blur))
+    small = mask.reduce(factor).filter(ImageFilter.GaussianBlur(blur / factor))
+    return small.resize(mask.size, Image.Resampling.BILINEAR)
+
+
+def render_text_masks(text, font, outline_width, effects=()):
+    measure = ImageDraw.Draw(Image.new("L", (1, 1)))
+    shapes = effect_shapes(outline_width, effects)
+    bounds = {}
+    for width in {outline_width} | {shape[0] for shape in shapes}:
+        bounds[width] = measure.textbbox((0, 0), text, font=font, anchor="mm", stroke_width=width)
+    left, top, right, bottom = bounds[outline_width]
+    for width, dx, dy, blur in shapes:
+        margin = shape_margin(blur)
+        l, t, r, b = bounds[width]
+        left, top = min(left, l + dx - margin), min(top, t + dy - margin)
+        right, bottom = max(right, r + dx + margin), max(bottom, b + dy + margin)
+    left, top = math.floor(left), math.floor(top)
+    size = (max(math.ceil(right) - left, 1), max(math.ceil(bottom) - top, 1))
+    origin = (-left, -top)
+
+    fill_mask = _shape_mask(size, origin, text, font, 0)
+    outer_mask = _shape_mask(size, origin, text, font, outline_width) if outline_width > 0 else fill_mask
+    shape_masks = {0: fill_mask, outline_width: outer_mask}
+    effect_masks = []
+    for width, dx, dy, blur in shapes:
+        mask = shape_masks.get(width)
+        if mask is None:
+            mask = shape_masks[width] = _shape_mask(size, origin, text, font, width)
+        if dx or dy:
+            shifted = Image.new("L", size, 0)
+            shifted.paste(mask, (dx, dy))
+            mask = shifted
+        if blur > 0:
+            mask = _blur_mask(mask, blur)
+        effect_masks.append(mask)
+    return TextSprite(fill_mask, outer_mask, left, top, effect_masks)
+
+
+def render_text_sprite(text, font, text_color, outline_color, outline_width, effects=()):
+    effects = normalize_effects(effects)
+    sprite = render_text_masks(text, font, outline_width, effects)
+    return RenderedText(sprite, sprite.compose(text_color, outline_color, effects))
+
+
+def paste_sprite(frame, sprite_image, left, top):
+    x0, y0 = max(left, 0), max(top, 0)
+    x1 = min(left + sprite_image.width, frame.width)
+    y1 = min(top + sprite_image.height, frame.height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    frame.alpha_composite(sprite_image, dest=(x0, y0), source=(x0 - left, y0 - top, x1 - left, y1 - top))
+    return (x0, y0, x1, y1)
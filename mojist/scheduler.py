@@ -0,0 +1,28 @@
+import time
+
+
+class RedrawScheduler:
+    def __init__(self, widget, callback, frame_ms=16):
+        self.widget = widget
+        self.callback = callback
+        self.frame_ms = frame_ms
+        self.pending = set()
+        self.job = None
+        self.last_flush = 0.0
+
+    def request(self, *changes):
+        self.pending.update(changes)
+        if self.job is not None:
+            return
+        wait_ms = self.frame_ms - (time.perf_counter() - self.last_flush) * 1000
+        if wait_ms > 1:
+            self.job = self.widget.after(int(wait_ms), self._run)
+        else:
+            self.job = self.widget.after_idle(self._run)
+
+    def _run(self):
+        self.job = None
+        changes, self.pending = self.pending, set()
+        self.last_flush = time.perf_counter()
+        if changes:
+            self.callback(changes)
@@ -0,0 +1,145 @@
+import argparse
+import csv
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+from PIL import Image
+
+from mojist.fonts import ensure_font_index
+from mojist.headless import load_background, place_text, save_image
+from mojist.project import project_layers, read_project
+from mojist.render import paste_sprite
+
+CHUNK_SIZE = 8
+
+_worker = {}
+
+
+def read_lines(path, column=None):
+    path = Path(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() != ".csv":
+            return [line.rstrip("\r\n") for line in f if line.strip()]
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    if column is None and "text" in rows[0]:
+        column = "text"
+    if isinstance(column, str) and not column.isdigit():
+        index = rows[0].index(column)
+        rows = rows[1:]
+    else:
+        index = int(column or 0)
+    return [row[index] for row in rows if len(row) > index and row[index].strip()]
+
+
+def _attach_shared(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(shm_name, size, settings, overlays):
+    shm = _attach_shared(shm_name)
+    background = Image.frombuffer("RGBA", size, shm.buf, "raw", "RGBA", 0, 1)
+    _worker.update(shm=shm, background=background, frame=background.copy(), settings=settings, overlays=overlays)
+
+
+def _render_lines(jobs):
+    background = _worker["background"]
+    frame = _worker["frame"]
+    settings = _worker["settings"]
+    overlays = _worker["overlays"]
+    results = []
+    for text, output_path in jobs:
+        try:
+            boxes = [paste_sprite(frame, *place_text(settings, frame.size, text))]
+            try:
+                boxes.extend(paste_sprite(frame, image, left, top) for image, left, top in overlays)
+                save_image(frame, output_path)
+            finally:
+                for box in boxes:
+                    if box is not None:
+                        frame.paste(background.crop(box), box[:2])
+            results.append((output_path, None))
+        except Exception:
+            results.append((output_path, traceback.format_exc()))
+    return results
+
+
+def export_sequence(project_path, lines, output_dir, fmt="png", workers=None, size=None, prefix="line_", start=1):
+    ensure_font_index()
+    layers = project_layers(read_project(project_path))
+    settings = layers[0]
+    background = load_background(settings["background_image_path"])
+    if size is not None and background.size != tuple(size):
+        background = background.resize(size)
+    if background.mode != "RGBA":
+        background = background.convert("RGBA")
+    overlays = [place_text(layer, background.size) for layer in layers[1:]]
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    digits = max(5, len(str(start + len(lines))))
+    jobs = [
+        (text, str(Path(output_dir) / f"{prefix}{n:0{digits}d}.{fmt}"))
+        for n, text in enumerate(lines, start)
+    ]
+    chunks = [jobs[i:i + CHUNK_SIZE] for i in range(0, len(jobs), CHUNK_SIZE)]
+
+    raw = background.tobytes()
+    shm = shared_memory.SharedMemory(create=True, size=len(raw))
+    failures = []
+    try:
+        shm.buf[:len(raw)] = raw
+        del raw
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(shm.name, background.size, settings, overlays)
+        ) as executor:
+            done = 0
+            for chunk_results in executor.map(_render_lines, chunks):
+                for output_path, error in chunk_results:
+                    done += 1
+                    if error:
+                        failures.append(output_path)
+                        print(f"[{done}/{len(jobs)}] 失敗: {output_path}\n{error}", file=sys.stderr)
+    finally:
+        shm.close()
+        shm.unlink()
+    return len(jobs), failures
+
+
+def _parse_size(value):
+    w, _, h = value.lower().partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mojist-sequence", description="テキスト/CSVの各行を連番画像として出力します。")
+    parser.add_argument("project", help="スタイルと背景に使うプロジェクト(.json)。各行は1番目のレイヤーの文字になります")
+    parser.add_argument("lines", help="1行1テロップのテキストファイル、またはCSVファイル")
+    parser.add_argument("-o", "--output", default="Output", help="出力先フォルダ (既定: Output)")
+    parser.add_argument("-f", "--format", choices=("png", "jpg"), default="png")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="並列プロセス数 (既定: CPU数)")
+    parser.add_argument("--column", default=None, help="CSVの列名または列番号 (既定: text 列、なければ先頭列)")
+    parser.add_argument("--prefix", default="line_", help="出力ファイル名の接頭辞")
+    parser.add_argument("--size", type=_parse_size, default=None, help="出力サイズ 例: 1920x1080 (既定: 背景画像の元サイズ)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    lines = read_lines(args.lines, args.column)
+    total, failures = export_sequence(args.project, lines, args.output, args.format, args.jobs, args.size, args.prefix)
+    elapsed = time.perf_counter() - start
+    print(f"{total - len(failures)}/{total} 枚を出力しました ({elapsed:.1f}秒): {args.output}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
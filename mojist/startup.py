@@ -0,0 +1,73 @@
+import json
+import os
+import sys
+import time
+
+STARTUP_BUDGET_MS = {"window": 500, "first_text": 700, "background": 1500}
+
+
+def process_age():
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+
+            creation, exit_, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            kernel32 = ctypes.windll.kernel32
+            if not kernel32.GetProcessTimes(
+                kernel32.GetCurrentProcess(), ctypes.byref(creation), ctypes.byref(exit_),
+                ctypes.byref(kernel), ctypes.byref(user)
+            ):
+                return None
+            now = wintypes.FILETIME()
+            kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+            to_int = lambda ft: (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+            return (to_int(now) - to_int(creation)) / 1e7
+        with open("/proc/self/stat", "r") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except Exception:
+        return None
+
+
+class StartupTimeline:
+    def __init__(self, t0, path, budget=STARTUP_BUDGET_MS):
+        self.t0 = t0
+        self.path = path
+        self.budget = budget
+        age = process_age()
+        self.before_script_ms = None if age is None else max(age - (time.perf_counter() - t0), 0) * 1000
+        self.marks = {}
+        self.finished = False
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.t0) * 1000
+
+    def over_budget(self):
+        return [name for name, limit in self.budget.items() if self.marks.get(name, 0) > limit]
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        report = {
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "before_script_ms": self.before_script_ms,
+            "marks_ms": {k: round(v, 1) for k, v in self.marks.items()},
+            "budget_ms": self.budget,
+            "over_budget": self.over_budget(),
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"起動時間の記録失敗: {e}")
+        if os.environ.get("MOJIST_STARTUP_TRACE") or report["over_budget"]:
+            timeline = ", ".join(f"{k}={v:.0f}ms" for k, v in self.marks.items())
+            print(f"起動タイムライン: {timeline}")
+            if report["over_budget"]:
+                print(f"起動時間が目標を超えました: {', '.join(report['over_budget'])}")
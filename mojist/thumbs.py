@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from mojist.cache import LRUCache
+
+
+def decode_thumbnail(path, size):
+    with Image.open(path) as img:
+        img.draft("RGB", size)
+        has_alpha = "A" in img.getbands() or "transparency" in img.info
+        img = img.convert("RGBA" if has_alpha else "RGB")
+        return img.resize(size, Image.Resampling.BICUBIC, reducing_gap=2.0)
+
+
+class ThumbnailStore:
+    INDEX_NAME = "index.json"
+    TOUCH_SECONDS = 60
+
+    def __init__(self, cache_dir, size, decode=decode_thumbnail, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.size = tuple(size)
+        self.decode = decode
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._index = self._read_index()
+        self.current_bytes = sum(entry[2] for entry in self._index.values())
+
+    def _read_index(self):
+        try:
+            with open(self.cache_dir / self.INDEX_NAME, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if tuple(data.get("size", ())) == self.size:
+                return {key: (list(entry) + [0, 0])[:4] for key, entry in data.get("entries", {}).items()}
+        except (OSError, ValueError, TypeError):
+            pass
+        return {}
+
+    def save_index(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"size": list(self.size), "entries": dict(self._index)}
+            self._dirty = False
+        tmp_path = self.cache_dir / (self.INDEX_NAME + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_dir / self.INDEX_NAME)
+        except OSError as e:
+            print(f"サムネイル索引の保存失敗: {e}")
+
+    def _thumb_path(self, key):
+        return self.cache_dir / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    def lookup(self, path):
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = [st.st_mtime_ns, st.st_size]
+        with self._lock:
+            entry = self._index.get(key)
+        thumb_path = self._thumb_path(key)
+        if entry is not None and entry[:2] == stamp:
+            try:
+                with Image.open(thumb_path) as img:
+                    img.load()
+            except OSError:
+                pass
+            else:
+                self._touch(entry)
+                return img, key, stamp
+        return None, key, stamp
+
+    def _touch(self, entry):
+        now = int(time.time())
+        with self._lock:
+            if now - entry[3] >= self.TOUCH_SECONDS:
+                entry[3] = now
+                self._dirty = True
+
+    def get(self, path):
+        img, key, stamp = self.lookup(path)
+        if img is not None:
+            return img
+        img = self.decode(path, self.size)
+        self.store(key, stamp, img)
+        return img
+
+    def store(self, key, stamp, img):
+        thumb_path = self._thumb_path(key)
+        try:
+            img.save(thumb_path, "PNG", compress_level=1)
+            nbytes = os.path.getsize(thumb_path)
+        except OSError as e:
+            print(f"サムネイルの保存失敗: {key}: {e}")
+            return
+        with self._lock:
+            old = self._index.get(key)
+            if old is not None:
+                self.current_bytes -= old[2]
+            self._index[key] = list(stamp) + [nbytes, int(time.time())]
+            self.current_bytes += nbytes
+            self._dirty = True
+            over = self.current_bytes > self.max_bytes
+        if over:
+            self._evict(self.max_bytes * 0.9)
+
+    def _evict(self, limit, keys=()):
+        with self._lock:
+            victims = [key for key in keys if key in self._index]
+            for key in victims:
+                self.current_bytes -= self._index.pop(key)[2]
+            for key, entry in sorted(self._index.items(), key=lambda item: item[1][3]):
+                if self.current_bytes <= limit:
+                    break
+                del self._index[key]
+                self.current_bytes -= entry[2]
+                victims.append(key)
+            if victims:
+                self._dirty = True
+        for key in victims:
+            try:
+                os.remove(self._thumb_path(key))
+            except OSError:
+                pass
+        return len(victims)
+
+    def prune(self):
+        started = time.time()
+        with self._lock:
+            entries = list(self._index.items())
+        missing = []
+        for key, entry in entries:
+            if not os.path.exists(key):
+                missing.append(key)
+            elif not entry[2]:
+                try:
+                    nbytes = os.path.getsize(self._thumb_path(key))
+                except OSError:
+                    missing.append(key)
+                    continue
+                with self._lock:
+                    if self._index.get(key) is entry:
+                        entry[2] = nbytes
+                        self.current_bytes += nbytes
+        removed = self._evict(self.max_bytes, missing)
+        with self._lock:
+            known = {self._thumb_path(key).name for key in self._index}
+        for path in self.cache_dir.glob("*.png"):
+            try:
+                if path.name not in known and path.stat().st_mtime < started:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        self.save_index()
+        return removed
+
+
+class ThumbnailLoader:
+    def __init__(self, store, widget, max_workers=None, max_bytes=32 * 1024 * 1024):
+        self.store = store
+        self.widget = widget
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="thumbnail"
+        )
+        self.memory = LRUCache(max_bytes, lambda img: img.width * img.height * len(img.getbands()))
+        self.results = queue.SimpleQueue()
+        self.futures = {}
+        self.callbacks = {}
+        self.poll_job = None
+
+    def _key(self, path):
+        path = os.fspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return path, None, None
+        return path, st.st_mtime_ns, st.st_size
+
+    def request(self, path, callback):
+        key = self._key(path)
+        img = self.memory.get(key)
+        if img is not None:
+            callback(img)
+            return
+        self.callbacks.setdefault(key, []).append(callback)
+        self._submit(key)
+
+    def prefetch(self, paths):
+        for path in paths:
+            key = self._key(path)
+            if key not in self.memory:
+                self._submit(key)
+
+    def cancel_pending(self):
+        for key, future in list(self.futures.items()):
+            if future.cancel():
+                del self.futures[key]
+        self.callbacks.clear()
+
+    def shutdown(self):
+        self.cancel_pending()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.poll_job is not None:
+            self.widget.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.store.save_index()
+
+    def _submit(self, key):
+        if key not in self.futures:
+            self.futures[key] = self.executor.submit(self._work, key)
+        if self.poll_job is None:
+            self.poll_job = self.widget.after(15, self._poll)
+
+    def _work(self, key):
+        try:
+            self.results.put((key, self.store.get(key[0]), None))
+        except Exception:
+            self.results.put((key, None, traceback.format_exc()))
+
+    def _poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                key, img, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.futures.pop(key, None)
+            if error:
+                print(f"サムネイル生成失敗: {Path(key[0]).name}\n{error}")
+            else:
+                self.memory.put(key, img)
+            for callback in self.callbacks.pop(key, []):
+                callback(img)
+        if self.futures:
+            self.poll_job = self.widget.after(15, self._poll)
+        else:
+            self.store.save_index()
@@ -0,0 +1,95 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class Tracer:
+    def __init__(self, capacity=20000):
+        self.enabled = False
+        self.events = deque(maxlen=capacity)
+        self.spans = {}
+        self.counters = {}
+        self.t0 = time.perf_counter()
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+            self.spans.clear()
+            self.counters.clear()
+
+    def _ts(self, t):
+        return round((t - self.t0) * 1e6, 1)
+
+    def record(self, name, start, end, args=None):
+        event = {
+            "name": name, "cat": "mojist", "ph": "X",
+            "ts": self._ts(start), "dur": round((end - start) * 1e6, 1),
+            "pid": self.pid, "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        ms = (end - start) * 1000
+        with self._lock:
+            self.events.append(event)
+            span = self.spans.get(name)
+            if span is None:
+                self.spans[name] = [1, ms, ms, ms]
+            else:
+                span[0] += 1
+                span[1] += ms
+                span[2] = max(span[2], ms)
+                span[3] = ms
+
+    def counter(self, name, **values):
+        event = {"name": name, "cat": "mojist", "ph": "C", "ts": self._ts(time.perf_counter()), "pid": self.pid, "args": values}
+        with self._lock:
+            self.events.append(event)
+            self.counters[name] = values
+
+    def summary(self):
+        with self._lock:
+            rows = [
+                (name, count, total / count, peak, last)
+                for name, (count, total, peak, last) in self.spans.items()
+            ]
+            counters = {name: dict(values) for name, values in self.counters.items()}
+        return sorted(rows, key=lambda row: -row[1] * row[2]), counters
+
+    def dump(self, path):
+        with self._lock:
+            events = list(self.events)
+        data = {
+            "traceEvents": [
+                {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "Mojist"}}
+            ] + events,
+            "displayTimeUnit": "ms",
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return len(events)
+
+
+tracer = Tracer()
+
+
+def traced(name):
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
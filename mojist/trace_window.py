@@ -0,0 +1,87 @@
+import time
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+
+
+class TraceStatsWindow:
+    def __init__(self, root, tracer, dump_dir, sample=None):
+        self.tracer = tracer
+        self.dump_dir = Path(dump_dir)
+        self.sample = sample
+        self.refresh_job = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title("処理時間の計測")
+        self.window.geometry("560x420")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        control_frame = tk.Frame(self.window)
+        control_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.enabled_var = tk.BooleanVar(value=tracer.enabled)
+        tk.Checkbutton(control_frame, text="計測する", variable=self.enabled_var, command=self._toggle).pack(side=tk.LEFT)
+        tk.Button(control_frame, text="トレース保存", command=self._dump).pack(side=tk.RIGHT)
+        tk.Button(control_frame, text="クリア", command=self._clear).pack(side=tk.RIGHT, padx=5)
+
+        self.tree = ttk.Treeview(
+            self.window, columns=("count", "avg", "max", "last"), show="tree headings", height=8
+        )
+        self.tree.heading("#0", text="処理")
+        self.tree.heading("count", text="回数")
+        self.tree.heading("avg", text="平均(ms)")
+        self.tree.heading("max", text="最大(ms)")
+        self.tree.heading("last", text="直近(ms)")
+        self.tree.column("#0", width=180)
+        for column in ("count", "avg", "max", "last"):
+            self.tree.column(column, width=80, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        self.counter_label = tk.Label(self.window, text="", justify=tk.LEFT, anchor=tk.W, font=("", 9))
+        self.counter_label.pack(fill=tk.X, padx=10, pady=5)
+        self.status_label = tk.Label(self.window, text="", anchor=tk.W, fg="#555555")
+        self.status_label.pack(fill=tk.X, padx=10, pady=(0, 5))
+
+        self._refresh()
+
+    def exists(self):
+        return self.window.winfo_exists()
+
+    def lift(self):
+        self.window.lift()
+
+    def close(self):
+        if self.refresh_job is not None:
+            self.window.after_cancel(self.refresh_job)
+            self.refresh_job = None
+        self.window.destroy()
+
+    def _toggle(self):
+        self.tracer.enable(self.enabled_var.get())
+
+    def _clear(self):
+        self.tracer.clear()
+        self._refresh(reschedule=False)
+
+    def _dump(self):
+        self.dump_dir.mkdir(parents=True, exist_ok=True)
+        path = self.dump_dir / time.strftime("trace-%Y%m%d-%H%M%S.json")
+        try:
+            count = self.tracer.dump(path)
+            self.status_label.config(text=f"{count} 件を保存しました: {path}")
+        except OSError as e:
+            self.status_label.config(text=f"保存に失敗しました: {e}")
+
+    def _refresh(self, reschedule=True):
+        if self.sample is not None and self.tracer.enabled:
+            self.sample()
+        rows, counters = self.tracer.summary()
+        self.tree.delete(*self.tree.get_children())
+        for name, count, avg, peak, last in rows:
+            self.tree.insert("", tk.END, text=name, values=(count, f"{avg:.2f}", f"{peak:.2f}", f"{last:.2f}"))
+        lines = []
+        for name, values in sorted(counters.items()):
+            text = ", ".join(f"{k}={v:.0%}" if k == "hit_rate" else f"{k}={v}" for k, v in values.items())
+            lines.append(f"{name}: {text}")
+        self.counter_label.config(text="\n".join(lines) or "計測データがありません")
+        if reschedule:
+            self.refresh_job = self.window.after(500, self._refresh)
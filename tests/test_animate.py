@@ -0,0 +1,44 @@
+from PIL import Image, ImageChops, ImageSequence, ImageStat
+
+from mojist.animate import export_animation
+
+
+def _gradient(path, size=(320, 180)):
+    image = Image.new("RGB", size)
+    image.putdata([(x * 255 // size[0], y * 255 // size[1], (x + y) % 256) for y in range(size[1]) for x in range(size[0])])
+    image.save(path)
+
+
+def _frames(path):
+    with Image.open(path) as image:
+        return [frame.convert("RGB") for frame in ImageSequence.Iterator(image)]
+
+
+def test_gif_frames_match_apng(tmp_path):
+    _gradient(tmp_path / "bg.png")
+    data = {"text": "テスト", "background_image_path": str(tmp_path / "bg.png")}
+    for motion in ("slide_in", "fade"):
+        gif_path, apng_path = tmp_path / f"{motion}.gif", tmp_path / f"{motion}.png"
+        assert export_animation(data, gif_path, motion, 1, 8) == 8
+        export_animation(data, apng_path, motion, 1, 8)
+        gif_frames, apng_frames = _frames(gif_path), _frames(apng_path)
+        assert len(gif_frames) == len(apng_frames) == 8
+        for gif_frame, apng_frame in zip(gif_frames, apng_frames):
+            diff = ImageStat.Stat(ImageChops.difference(gif_frame, apng_frame)).mean
+            assert sum(diff) / 3 < 8
+
+
+def test_webp_merges_still_frames_and_keeps_timing(tmp_path):
+    _gradient(tmp_path / "bg.png")
+    data = {"text": "テスト", "background_image_path": str(tmp_path / "bg.png")}
+    export_animation(data, tmp_path / "fade.webp", "fade", 1, 10)
+    export_animation(data, tmp_path / "fade.png", "fade", 1, 10)
+    apng_frames = _frames(tmp_path / "fade.png")
+    with Image.open(tmp_path / "fade.webp") as image:
+        index = 0
+        for frame in ImageSequence.Iterator(image):
+            frame.load()
+            diff = ImageStat.Stat(ImageChops.difference(frame.convert("RGB"), apng_frames[index])).mean
+            assert sum(diff) / 3 < 8
+            index += frame.info["duration"] // 100
+    assert index == len(apng_frames)
@@ -0,0 +1,18 @@
+from mojist.autorender import RenderService
+
+
+def test_broken_projects_do_not_stop_the_service(tmp_path):
+    projects = tmp_path / "Projects"
+    projects.mkdir()
+    (projects / "list.json").write_text("[1, 2]", encoding="utf-8")
+    (projects / "layers.json").write_text('{"layers": [1]}', encoding="utf-8")
+    (projects / "good.json").write_text('{"text": "テスト"}', encoding="utf-8")
+
+    service = RenderService(projects, tmp_path / "Output", workers=1, size=(160, 90), debounce=0, prefer_native=False)
+    service.start()
+    try:
+        service.run(interval=0.05, once=True)
+    finally:
+        service.close()
+    assert service.stats == {"rendered": 1, "skipped": 0, "failed": 2}
+    assert (tmp_path / "Output" / "good.png").is_file()
@@ -0,0 +1,20 @@
+from PIL import Image
+
+from mojist.batch import render_directory
+
+
+def test_outputs_mirror_project_folders(tmp_path):
+    Image.new("RGB", (160, 90), (40, 80, 120)).save(tmp_path / "bg.png")
+    projects = tmp_path / "Projects"
+    for folder in ("a", "b"):
+        (projects / folder).mkdir(parents=True)
+        (projects / folder / "shot.json").write_text(
+            f'{{"text": "{folder}", "background_image_path": "{(tmp_path / "bg.png").as_posix()}"}}', encoding="utf-8"
+        )
+    (projects / "broken.json").write_text("[1, 2]", encoding="utf-8")
+
+    total, failures = render_directory(projects, tmp_path / "Output", workers=1)
+    assert total == 3
+    assert failures == [str(projects / "broken.json")]
+    assert (tmp_path / "Output" / "a" / "shot.png").is_file()
+    assert (tmp_path / "Output" / "b" / "shot.png").is_file()
@@ -0,0 +1,25 @@
+import pytest
+
+from mojist.library import ProjectLibrary
+from mojist.project import read_project
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", '{"layers": 3}', '{"layers": [1]}'])
+def test_read_project_rejects_invalid_shapes(tmp_path, content):
+    path = tmp_path / "bad.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_project(path)
+
+
+def test_sync_keeps_valid_projects_next_to_broken_ones(tmp_path):
+    projects = tmp_path / "Projects"
+    projects.mkdir()
+    (projects / "good.json").write_text('{"text": "こんにちは"}', encoding="utf-8")
+    (projects / "list.json").write_text("[1, 2]", encoding="utf-8")
+    (projects / "number.json").write_text('{"text": 5}', encoding="utf-8")
+
+    library = ProjectLibrary(tmp_path / "library.db", projects)
+    assert library.sync() == 3
+    assert [row["text"] for row in library.search("こんにちは")] == ["こんにちは"]
+    assert len(library.search()) == 3
@@ -0,0 +1,34 @@
+from mojist.cache import LRUCache
+from mojist.history import History
+from mojist.memory import MemoryBudget
+
+
+class Blob:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def test_enforce_skips_caches_that_cannot_shrink():
+    budget = MemoryBudget(150)
+    single = budget.register("single", LRUCache(1000, lambda blob: blob.nbytes), priority=0)
+    many = budget.register("many", LRUCache(1000, lambda blob: blob.nbytes), priority=1)
+    single.put("a", Blob(100))
+    for key in "bcd":
+        many.put(key, Blob(40))
+    assert len(single) == 1
+    assert len(many) == 1
+    assert budget.evictions == 2
+
+
+def test_history_counts_shared_images_once():
+    cached = {}
+    history = History(counted_elsewhere=lambda value: id(value) in cached)
+    first, second = Blob(10_000), Blob(10_000)
+    history.reset({"background": first})
+    history.commit({"background": second})
+    assert history.current_bytes >= 20_000
+    cached[id(first)] = first
+    cached[id(second)] = second
+    assert history.current_bytes < 10_000
+    del cached[id(first)]
+    assert 10_000 <= history.current_bytes < 20_000
@@ -0,0 +1,27 @@
+import json
+
+from PIL import Image, ImageChops
+
+from mojist.headless import render_project
+from mojist.sequence import export_sequence
+
+
+def test_upper_layers_stay_above_each_line(tmp_path):
+    Image.new("RGB", (320, 180), (30, 90, 60)).save(tmp_path / "bg.png")
+    data = {
+        "background_image_path": str(tmp_path / "bg.png"),
+        "canvas_size": [320, 180],
+        "layers": [
+            {"text": "BOTTOM", "font_size": 40, "x": 160, "y": 90, "text_color": "red", "outline_width": 0},
+            {"text": "BOTTOM", "font_size": 40, "x": 160, "y": 90, "text_color": "blue", "outline_width": 0},
+        ],
+    }
+    (tmp_path / "project.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    total, failures = export_sequence(tmp_path / "project.json", ["BOTTOM"], tmp_path / "out", workers=1)
+    assert (total, failures) == (1, [])
+    with Image.open(tmp_path / "out" / "line_00001.png") as image:
+        exported = image.convert("RGB")
+    expected = render_project(data).convert("RGB")
+    assert ImageChops.difference(exported, expected).getbbox() is None
+    assert (0, 0, 255) in {color for _, color in expected.getcolors(320 * 180)}
@@ -0,0 +1,87 @@
+import os
+
+from PIL import Image
+
+from mojist.thumbs import ThumbnailLoader, ThumbnailStore
+
+
+class FakeWidget:
+    def __init__(self):
+        self.jobs = []
+
+    def after(self, ms, func):
+        self.jobs.append(func)
+        return len(self.jobs)
+
+    def after_cancel(self, job):
+        pass
+
+
+def _load(loader, widget, path):
+    results = []
+    loader.request(path, results.append)
+    while not results:
+        for future in list(loader.futures.values()):
+            future.result()
+        jobs, widget.jobs = widget.jobs, []
+        for job in jobs:
+            job()
+    return results[0]
+
+
+def test_memory_hit_follows_source_changes(tmp_path):
+    path = tmp_path / "bg.png"
+    Image.new("RGB", (64, 36), (255, 0, 0)).save(path)
+    widget = FakeWidget()
+    loader = ThumbnailLoader(ThumbnailStore(tmp_path / "thumbs", (32, 18)), widget, max_workers=1)
+    try:
+        assert _load(loader, widget, path).getpixel((0, 0))[:3] == (255, 0, 0)
+        st = os.stat(path)
+        Image.new("RGB", (64, 36), (0, 0, 255)).save(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        assert _load(loader, widget, path).getpixel((0, 0))[:3] == (0, 0, 255)
+    finally:
+        loader.shutdown()
+
+
+def _sources(folder, count):
+    folder.mkdir()
+    paths = []
+    for i in range(count):
+        path = folder / f"{i}.png"
+        Image.effect_noise((64, 36), 40 + i).save(path)
+        paths.append(path)
+    return paths
+
+
+def test_store_evicts_least_recently_used_over_cap(tmp_path):
+    paths = _sources(tmp_path / "src", 7)
+    store = ThumbnailStore(tmp_path / "thumbs", (64, 36))
+    for i, path in enumerate(paths[:6]):
+        store.get(path)
+        store._index[os.path.abspath(path)][3] = i
+    store._index[os.path.abspath(paths[0])][3] = 100
+    store.max_bytes = store.current_bytes
+    store.get(paths[6])
+    assert store.current_bytes <= store.max_bytes * 0.9
+    assert os.path.abspath(paths[0]) in store._index
+    assert os.path.abspath(paths[6]) in store._index
+    assert os.path.abspath(paths[1]) not in store._index
+    assert len(list((tmp_path / "thumbs").glob("*.png"))) == len(store._index)
+
+
+def test_prune_drops_missing_sources_and_orphans(tmp_path):
+    paths = _sources(tmp_path / "src", 3)
+    store = ThumbnailStore(tmp_path / "thumbs", (64, 36))
+    for path in paths:
+        store.get(path)
+    store.save_index()
+    (tmp_path / "thumbs" / "orphan.png").write_bytes(b"x")
+    os.utime(tmp_path / "thumbs" / "orphan.png", (0, 0))
+    paths[0].unlink()
+
+    reopened = ThumbnailStore(tmp_path / "thumbs", (64, 36))
+    assert reopened.prune() == 2
+    assert sorted(reopened._index) == sorted(os.path.abspath(p) for p in paths[1:])
+    assert len(list((tmp_path / "thumbs").glob("*.png"))) == 2
+    assert ThumbnailStore(tmp_path / "thumbs", (64, 36)).current_bytes == reopened.current_bytes > 0